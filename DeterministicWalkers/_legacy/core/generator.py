@@ -1,5 +1,5 @@
-import json
 import os
+import zlib
 from datetime import datetime
 from pathlib import Path
 from typing import List, Type, Dict, Any
@@ -12,6 +12,8 @@ class Generator:
     Manages the registration of scenarios and the generation loop.
     """
     
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, output_dir: str, seed: int = 42, predataset: bool = True, paraphraser: Any = None):
         self.output_dir = Path(output_dir)
         self.global_seed = seed
@@ -29,13 +31,27 @@ class Generator:
         temp_instance = scenario_cls()
         self.scenarios[temp_instance.name] = scenario_cls
 
-    def generate_all(self, count_per_scenario: int = 100):
+    def generate_all(self, count_per_scenario: int = 100, workers: int = 1):
         """
         Generate samples for all registered scenarios.
         
         Args:
             count_per_scenario: Number of samples to generate per scenario.
+            workers: Number of processes. Scenarios are independent (own file, own
+                per-sample seeds), so each one can run in its own worker with
+                byte-identical output.
         """
+        if workers > 1 and len(self.scenarios) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(self.scenarios))) as pool:
+                futures = [
+                    pool.submit(self.generate_scenario, name, count_per_scenario)
+                    for name in self.scenarios
+                ]
+                for future in futures:
+                    future.result()
+            return
+        
         for name, cls in self.scenarios.items():
             self.generate_scenario(name, count_per_scenario)
 
@@ -56,18 +72,18 @@ class Generator:
         output_file = self.output_dir / f"{scenario_name}.jsonl"
         print(f"Generating {count} samples for '{scenario_name}' to {output_file}...")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
+        # Deterministic seed for each sample:
+        # combine global seed, scenario name hash (deterministic), and index
+        scenario_hash = zlib.adler32(scenario_name.encode('utf-8'))
+        
+        # 1 MiB write buffer: samples are streamed out one by one, never held in memory
+        with open(output_file, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as f:
             for i in range(count):
-                # Deterministic seed for this specific sample
-                # Combine global seed, scenario name hash (deterministic), and index
-                import zlib
-                scenario_hash = zlib.adler32(scenario_name.encode('utf-8'))
                 sample_seed = self.global_seed + scenario_hash + i
                 rng = SeededRandom(sample_seed)
                 
                 try:
-                    sample = scenario.generate(rng, i, predataset=self.predataset)
-                    f.write(json.dumps(sample, ensure_ascii=False) + '\n')
+                    scenario.generate_to(rng, i, f, predataset=self.predataset)
                 except Exception as e:
                     print(f"Error generating sample {i} for {scenario_name}: {e}")
                     # In strict mode we might want to raise, but for now log and continue
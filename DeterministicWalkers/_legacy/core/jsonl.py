@@ -0,0 +1,6 @@
+import json
+
+# Single JSONL record encoder for the scenario writer, hydrator and slicer, so
+# their output format cannot drift apart. Built once: json.dumps creates a new
+# JSONEncoder on every call when non-default options are passed.
+encode_record = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
@@ -29,6 +29,10 @@ class SeededRandom:
         """Return random integer in range [a, b], including both end points."""
         return self._rng.randint(a, b)
         
+    def randbelow(self, n: int) -> int:
+        """Return random index in range [0, n); same stream as randint(0, n - 1), less call overhead."""
+        return self._rng.randrange(n)
+        
     def random(self) -> float:
         """Return the next random floating point number in the range [0.0, 1.0)."""
         return self._rng.random()
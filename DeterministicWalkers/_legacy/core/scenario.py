@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, TextIO
+from .jsonl import encode_record
 from .random import SeededRandom
 
 class Scenario(ABC):
@@ -47,6 +48,16 @@ class Scenario(ABC):
             
         return Scenario._corpus_cache
 
+    @property
+    def rephrase_fn(self):
+        """
+        self.rephrase when a paraphraser is configured, else None.
+        
+        Without a paraphraser rephrase() returns its input and draws nothing from
+        rng, so callers can skip the call entirely by checking this first.
+        """
+        return self.rephrase if self.paraphraser else None
+
     def rephrase(self, rng: SeededRandom, text: str, chance: float = 0.5) -> str:
         """
         Conditionally rephrase text using the paraphraser if available.
@@ -71,3 +82,13 @@ class Scenario(ABC):
             A dictionary representing the generated sample (messages + _meta).
         """
         pass
+
+    def generate_to(self, rng: SeededRandom, run_id: int, out_fp: TextIO, **kwargs) -> None:
+        """
+        Generate a single sample and write it straight to out_fp as one JSONL record.
+        
+        The sample is serialized before writing, so a failing generate() never
+        leaves a partial line in the output.
+        """
+        sample = self.generate(rng, run_id, **kwargs)
+        out_fp.write(encode_record(sample) + '\n')
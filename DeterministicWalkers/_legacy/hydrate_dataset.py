@@ -4,6 +4,7 @@ import json
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
+from core.jsonl import encode_record
 
 class DataSetHydrator:
     """
@@ -11,12 +12,26 @@ class DataSetHydrator:
     Decoupled from specific prompt formats; uses placeholder replacement.
     """
     
+    # Output is written line by line; a 1 MiB buffer batches those writes
+    WRITE_BUFFER_SIZE = 1 << 20
+    
+    # Fallback values for context params missing from a record
+    DEFAULT_PARAMS = {
+        "origin": "UNKNOWN",
+        "ctx_time": "12:00",
+        "date": "2024-05-01",
+        "ui_state": '{"state":"idle"}',
+        "trains_array": "[]"
+    }
+    
     def __init__(self, template_path: Path, tools_path: Optional[Path] = None, remove_meta: bool = False):
         self.template_path = template_path
         self.tools_path = tools_path
         self.remove_meta = remove_meta
         self.template_content = self._load_template()
         self.tools_content = self._load_tools()
+        # Compiled Jinja2 template, built on first use (see _get_template)
+        self._template = None
 
     def _load_template(self) -> str:
         if not self.template_path.exists():
@@ -35,6 +50,13 @@ class DataSetHydrator:
             print(f"Warning: Invalid JSON in tools definition file: {self.tools_path}")
             return None
 
+    def _get_template(self):
+        """Compile the system prompt template once; it is the same for every record."""
+        if self._template is None:
+            from jinja2 import Template
+            self._template = Template(self.template_content)
+        return self._template
+
     def hydrate_line(self, line_content: str) -> str:
         """Hydrate a single JSONL line."""
         try:
@@ -58,20 +80,10 @@ class DataSetHydrator:
                 
                 # Perform substitution using Jinja2
                 try:
-                    from jinja2 import Template
-                    template = Template(self.template_content)
-                    
-                    # Defaults
-                    defaults = {
-                         "origin": "UNKNOWN",
-                         "ctx_time": "12:00",
-                         "date": "2024-05-01",
-                         "ui_state": '{"state":"idle"}',
-                         "trains_array": "[]"
-                    }
+                    template = self._get_template()
                     
                     # Merge defaults with actual params
-                    hydration_context = defaults.copy()
+                    hydration_context = self.DEFAULT_PARAMS.copy()
                     hydration_context.update(meta_params)
                     
                     hydrated_content = template.render(**hydration_context)
@@ -82,13 +94,13 @@ class DataSetHydrator:
                     raise
                 except Exception as e:
                     print(f"Error rendering template: {e}")
-                    return json.dumps(data, ensure_ascii=False)
+                    return encode_record(data)
 
         # 3. Remove Meta if requested
         if self.remove_meta:
             data.pop("_meta", None)
 
-        return json.dumps(data, ensure_ascii=False)
+        return encode_record(data)
 
     def _extract_params(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract hydration parameters from _meta field."""
@@ -105,7 +117,7 @@ class DataSetHydrator:
         """Process a single file and return hydrated line count."""
         count = 0
         with open(input_path, 'r', encoding='utf-8') as fin, \
-             open(output_path, 'w', encoding='utf-8') as fout:
+             open(output_path, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as fout:
             for line in fin:
                 line = line.strip()
                 if not line: continue
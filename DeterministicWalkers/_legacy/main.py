@@ -27,6 +27,7 @@ def main():
     parser.add_argument("--scenario", type=str, help="Run only a specific scenario (by name)")
     parser.add_argument("--random", action="store_true", help="Use random seed (time-based) instead of fixed seed")
     parser.add_argument("--paraphrase", action="store_true", help="Use LLM to paraphrase user messages (requires Ollama/OpenAI)")
+    parser.add_argument("--workers", "-j", type=int, default=1, help="Generate scenarios in parallel across N processes")
     
     args = parser.parse_args()
 
@@ -100,7 +101,7 @@ def main():
     if args.scenario:
         gen.generate_scenario(args.scenario, count=args.count)
     else:
-        gen.generate_all(count_per_scenario=args.count)
+        gen.generate_all(count_per_scenario=args.count, workers=args.workers)
         
     print("Predataset generation complete.")
 
@@ -1,37 +1,52 @@
 import json
 import random
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+# "HH:MM" for every minute of the day, indexed by minutes since midnight
+_HHMM = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(60))
+
+# Train number suffixes "1000".."9999": choice() over this pool draws exactly like
+# randint(1000, 9999) but skips the int formatting per train
+_TRAIN_NUMBERS = tuple(map(str, range(1000, 10000)))
+
 class MockBackend:
     """
     A mock backend that simulates Trenitalia API responses.
     It generates consistent, semi-realistic data for train searches and purchases.
     """
-    def __init__(self, seed: Optional[int] = None):
-        self.rng = random.Random(seed)
-        self.current_search_results: List[Dict] = []
-        self.current_page = 0
-        self.page_size = 3
-        
-        # Heuristics for realistic generation
-        self.train_types = [
+    
+    # Heuristics for realistic generation. "duration" is the base trip length in
+    # minutes (180 / speed), precomputed so the search loop doesn't redo it per train.
+    TRAIN_TYPES = tuple(
+        dict(t, duration=int(180 / t["speed"])) for t in (
             {"type": "Frecciarossa", "speed": 1.5, "price_base": 50, "stops": 0},
             {"type": "Frecciargento", "speed": 1.4, "price_base": 40, "stops": 2},
             {"type": "Intercity", "speed": 1.0, "price_base": 25, "stops": 5},
             {"type": "Regionale Veloce", "speed": 0.8, "price_base": 12, "stops": 8},
             {"type": "Regionale", "speed": 0.6, "price_base": 8, "stops": 15},
-        ]
-
-    def _generate_train_id(self, train_type: str) -> str:
-        prefix_map = {
-            "Frecciarossa": "FR", "Frecciargento": "FA", "Frecciabianca": "FB",
-            "Intercity": "IC", "Regionale Veloce": "RV", "Regionale": "R"
-        }
-        prefix = prefix_map.get(train_type, "TR")
-        number = self.rng.randint(1000, 9999)
-        return f"{prefix}{number}"
+        )
+    )
+    
+    TRAIN_ID_PREFIXES = {
+        "Frecciarossa": "FR", "Frecciargento": "FA", "Frecciabianca": "FB",
+        "Intercity": "IC", "Regionale Veloce": "RV", "Regionale": "R"
+    }
+    
+    # TRAIN_TYPES as parallel columns, indexed by one draw per train in search_trains
+    _TYPE_NAMES = tuple(t["type"] for t in TRAIN_TYPES)
+    _TYPE_DURATIONS = tuple(t["duration"] for t in TRAIN_TYPES)
+    _TYPE_PRICES = tuple(t["price_base"] for t in TRAIN_TYPES)
+    _TYPE_STOPS = tuple(t["stops"] for t in TRAIN_TYPES)
+    _TYPE_ID_PREFIXES = tuple(map(TRAIN_ID_PREFIXES.get, _TYPE_NAMES, ("TR",) * len(_TYPE_NAMES)))
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.current_search_results: List[Dict] = []
+        self.current_page = 0
+        self.page_size = 3
+        self.train_types = self.TRAIN_TYPES
 
     def _parse_time(self, time_str: str) -> datetime:
         """Parses vague or specific time strings into a datetime object (today)."""
@@ -48,7 +63,11 @@ class MockBackend:
             base_date = base_date.replace(hour=19, minute=0)
         elif ":" in time_str:
             try:
-                h, m = map(int, time_str.split(":"))
+                if len(time_str) == 5 and time_str[2] == ":":
+                    # Canonical "HH:MM" (what the scenarios emit): slice, no split list
+                    h, m = int(time_str[:2]), int(time_str[3:])
+                else:
+                    h, m = map(int, time_str.split(":"))
                 base_date = base_date.replace(hour=h, minute=m)
             except:
                 pass # Fallback to now
@@ -75,36 +94,41 @@ class MockBackend:
         num_results = self.rng.randint(8, 15)
         results = []
         
-        current_dt = start_time
+        # Walk the timetable in minutes since midnight; labels wrap like datetime would
+        current_min = start_time.hour * 60 + start_time.minute
+        
+        # Bound once for the loop (same draws, in the same order, as self.rng.*).
+        # randrange(n) consumes the stream exactly like choice() over n types.
+        randint, randrange, rand = self.rng.randint, self.rng.randrange, self.rng.random
+        choice = self.rng.choice
+        n_types = len(self._TYPE_NAMES)
         
         for i in range(num_results):
             # Advance time by 15-60 mins for next train
-            gap = self.rng.randint(15, 60)
-            current_dt += timedelta(minutes=gap)
+            gap = randint(15, 60)
+            current_min += gap
             
             # Pick type
-            t_type = self.rng.choice(self.train_types)
+            t_idx = randrange(n_types)
             
             # Calculate duration (mock logic: pure random duration based on 'speed')
             # Assuming average trip is 200km. 
             # Duration (hours) = 200 / (100 * speed) roughly
-            base_duration_mins = int(180 / t_type["speed"]) 
-            duration_variation = self.rng.randint(-20, 20)
+            base_duration_mins = self._TYPE_DURATIONS[t_idx]
+            duration_variation = randint(-20, 20)
             duration_mins = max(30, base_duration_mins + duration_variation)
             
-            arrival_dt = current_dt + timedelta(minutes=duration_mins)
-            
             # Price logic
-            price = t_type["price_base"] * (1 + (self.rng.random() * 0.4 - 0.2)) # +/- 20%
+            price = self._TYPE_PRICES[t_idx] * (1 + (rand() * 0.4 - 0.2)) # +/- 20%
             price = round(price, 2)
             
             train = {
                 "pos": i + 1, # Provisional pos, will be re-indexed on paging
-                "id": self._generate_train_id(t_type["type"]),
-                "dep": current_dt.strftime("%H:%M"),
-                "arr": arrival_dt.strftime("%H:%M"),
-                "type": t_type["type"],
-                "stops": t_type["stops"],
+                "id": self._TYPE_ID_PREFIXES[t_idx] + choice(_TRAIN_NUMBERS),
+                "dep": _HHMM[current_min % 1440],
+                "arr": _HHMM[(current_min + duration_mins) % 1440],
+                "type": self._TYPE_NAMES[t_idx],
+                "stops": self._TYPE_STOPS[t_idx],
                 "price": price
             }
             results.append(train)
@@ -9,7 +9,7 @@ This file now re-exports them for backward compatibility.
 """
 
 # Re-export Resource Managers
-from scenarios.common.resource_managers import StationManager, TimeManager, TrainManager
+from scenarios.common.resource_managers import StationManager, TimeManager, TrainManager, QAManager
 
 # Re-export Builders
 from scenarios.common.builders import MessageBuilder, ContextBuilder, ToolCallBuilder
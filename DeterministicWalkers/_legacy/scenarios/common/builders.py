@@ -1,20 +1,57 @@
 
-import json
+from json.encoder import encode_basestring_ascii as _json_str
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from core.random import SeededRandom
 
+# Lazily imported MockBackend class (mock_api lives in the project root)
+_mock_backend_cls = None
+
+def get_mock_backend_cls():
+    """Import MockBackend once, adding the project root to sys.path if needed."""
+    global _mock_backend_cls
+    if _mock_backend_cls is None:
+        # Lazy import to avoid circular dependencies
+        import sys
+        # Builders is in scenarios/common/, mock_api is in root/
+        root_path = str(Path(__file__).parent.parent.parent)
+        if root_path not in sys.path:
+            sys.path.append(root_path)
+        from mock_api import MockBackend
+        _mock_backend_cls = MockBackend
+    return _mock_backend_cls
+
 class MessageBuilder:
     """Fluent interface for constructing conversation messages."""
     
+    # Pre-formatted sequential tool call IDs (conversations rarely exceed a few calls)
+    TOOL_CALL_IDS = tuple(f"call_{i:03d}" for i in range(64))
+    
     def __init__(self, predataset: bool = True):
         self.messages: List[Dict[str, Any]] = []
+        # Bound once: every add_* call appends, so skip the attribute lookup
+        self._append = self.messages.append
         self.predataset = predataset
         self.tool_call_counter = 0
 
+    def reset(self, predataset: bool = True) -> 'MessageBuilder':
+        """
+        Start a new conversation on this builder.
+        
+        The message list is rebound rather than cleared: get_messages() hands the
+        previous list to the caller, which keeps it in the generated sample.
+        """
+        self.messages = []
+        self._append = self.messages.append
+        self.predataset = predataset
+        self.tool_call_counter = 0
+        return self
+
     def generate_tool_call_id(self) -> str:
         """Generate a sequential tool call ID for this conversation."""
         self.tool_call_counter += 1
+        if self.tool_call_counter < len(self.TOOL_CALL_IDS):
+            return self.TOOL_CALL_IDS[self.tool_call_counter]
         return f"call_{self.tool_call_counter:03d}"
     
     def add_system(self, origin: Optional[str] = None, ctx_time: Optional[str] = None) -> 'MessageBuilder':
@@ -25,22 +62,22 @@ class MessageBuilder:
             # Hydrated system prompt placeholder (should usually use predataset for training generation)
             content = f"Sei Talìa, l'assistente virtuale di Trenitalia.\n<ctx>stazione: {origin}\nora: {ctx_time}\n</ctx>\n"
         
-        self.messages.append({"role": "system", "content": content})
+        self._append({"role": "system", "content": content})
         return self
     
     def add_user(self, content: str) -> 'MessageBuilder':
         """Add user message."""
-        self.messages.append({"role": "user", "content": content})
+        self._append({"role": "user", "content": content})
         return self
     
     def add_assistant(self, content: str) -> 'MessageBuilder':
         """Add assistant text message."""
-        self.messages.append({"role": "assistant", "content": content})
+        self._append({"role": "assistant", "content": content})
         return self
     
     def add_assistant_with_tool(self, tool_call: Dict[str, Any]) -> 'MessageBuilder':
         """Add assistant message with tool call."""
-        self.messages.append({
+        self._append({
             "role": "assistant",
             "tool_calls": [tool_call],
             "content": None
@@ -49,7 +86,7 @@ class MessageBuilder:
     
     def add_tool_response(self, content: str, tool_call_id: str, name: str) -> 'MessageBuilder':
         """Add tool response message."""
-        self.messages.append({
+        self._append({
             "role": "tool",
             "content": content,
             "tool_call_id": tool_call_id,
@@ -57,6 +94,24 @@ class MessageBuilder:
         })
         return self
     
+    def add_tool_exchange(self, tool_call: Dict[str, Any], content: str, name: str, reply: str) -> 'MessageBuilder':
+        """Add tool call, tool response and the assistant's follow-up reply in one go."""
+        self.messages.extend((
+            {
+                "role": "assistant",
+                "tool_calls": [tool_call],
+                "content": None
+            },
+            {
+                "role": "tool",
+                "content": content,
+                "tool_call_id": tool_call["id"],
+                "name": name
+            },
+            {"role": "assistant", "content": reply}
+        ))
+        return self
+    
     def get_messages(self) -> List[Dict[str, Any]]:
         """Get all messages."""
         return self.messages
@@ -71,7 +126,37 @@ class ContextBuilder:
     
     def __init__(self, default_date: str = "2025-12-23"):
         self.contexts: List[Dict[str, Any]] = []
+        self._append = self.contexts.append
         self.default_date = default_date
+        
+        # Params templates cloned for each entry (dict.copy is cheaper than
+        # inserting key by key). Key order matches the serialized layout.
+        self._params_template = {
+            "origin": None,
+            "ui_state": '{"state":"idle"}',
+            "trains_array": "[]",
+            "date": default_date
+        }
+        self._timed_params_template = {
+            "origin": None,
+            "ui_state": '{"state":"idle"}',
+            "trains_array": "[]",
+            "ctx_time": None,
+            "date": default_date
+        }
+    
+    def reset(self, default_date: str = "2025-12-23") -> 'ContextBuilder':
+        """
+        Start a new sample on this builder, keeping the params templates.
+        
+        The contexts list is rebound (not cleared) since get_contexts() returned it.
+        """
+        self.contexts = []
+        self._append = self.contexts.append
+        self.default_date = default_date
+        self._params_template["date"] = default_date
+        self._timed_params_template["date"] = default_date
+        return self
     
     def add_context(
         self,
@@ -84,21 +169,24 @@ class ContextBuilder:
         **extra_params
     ) -> 'ContextBuilder':
         """Add a context entry."""
-        params = {
-            "origin": origin,
-            "ui_state": ui_state,
-            "trains_array": trains_array
-        }
-        
         if ctx_time:
+            params = self._timed_params_template.copy()
             params["ctx_time"] = ctx_time
+        else:
+            params = self._params_template.copy()
+        
+        params["origin"] = origin
+        params["ui_state"] = ui_state
+        params["trains_array"] = trains_array
         
-        params["date"] = date if date is not None else self.default_date
+        if date is not None:
+            params["date"] = date
         
         # Add any extra parameters
-        params.update(extra_params)
+        if extra_params:
+            params.update(extra_params)
         
-        self.contexts.append({
+        self._append({
             "slice_length": slice_length,
             "params": params
         })
@@ -122,20 +210,19 @@ class ToolCallBuilder:
         passengers: int = 1
     ) -> Dict[str, Any]:
         """Build a search_trains tool call."""
-        args = {
-            "origin": origin,
-            "destination": destination,
-            "date": date,
-            "time": time,
-            "passengers": passengers
-        }
+        # Fixed-shape arguments: fill the JSON skeleton directly instead of
+        # building a dict for json.dumps (same output, default separators/escaping)
+        arguments = (
+            f'{{"origin": {_json_str(origin)}, "destination": {_json_str(destination)}, '
+            f'"date": {_json_str(date)}, "time": {_json_str(time)}, "passengers": {int(passengers)}}}'
+        )
         
         return {
             "id": tool_call_id,
             "type": "function",
             "function": {
                 "name": "search_trains",
-                "arguments": json.dumps(args)
+                "arguments": arguments
             }
         }
     
@@ -146,17 +233,14 @@ class ToolCallBuilder:
         train_class: str = "Seconda Classe"
     ) -> Dict[str, Any]:
         """Build a purchase_ticket tool call."""
-        args = {
-            "train_id": train_id,
-            "class": train_class
-        }
+        arguments = f'{{"train_id": {_json_str(train_id)}, "class": {_json_str(train_class)}}}'
         
         return {
             "id": tool_call_id,
             "type": "function",
             "function": {
                 "name": "purchase_ticket",
-                "arguments": json.dumps(args)
+                "arguments": arguments
             }
         }
     
@@ -168,34 +252,20 @@ class ToolCallBuilder:
         Returns:
             (tool_response_json, trains_list)
         """
-        # Lazy import to avoid circular dependencies
-        import sys
-        # Careful with path here. Builders is in scenarios/common/
-        # mock_api is in root/
-        root_path = Path(__file__).parent.parent.parent
-        if str(root_path) not in sys.path:
-             sys.path.append(str(root_path))
-        from mock_api import MockBackend
-        
-        backend = MockBackend(seed=rng.seed + run_id)
+        backend = get_mock_backend_cls()(seed=rng.seed + run_id)
         
         args_json = tool_call["function"]["arguments"]
         response_json = backend.search_trains(args_json)
-        response_data = json.loads(response_json)
-        trains = response_data.get("trains", [])
+        # The response is the first page of the backend's results; take it from
+        # there instead of parsing the JSON we were just handed back.
+        trains = backend.current_search_results[:backend.page_size]
         
         return response_json, trains
     
     @staticmethod
     def execute_purchase(rng: SeededRandom, run_id: int, tool_call: Dict[str, Any]) -> str:
         """Execute purchase using MockBackend."""
-        import sys
-        root_path = Path(__file__).parent.parent.parent
-        if str(root_path) not in sys.path:
-             sys.path.append(str(root_path))
-        from mock_api import MockBackend
-
-        backend = MockBackend(seed=rng.seed + run_id)
+        backend = get_mock_backend_cls()(seed=rng.seed + run_id)
         
         args_json = tool_call["function"]["arguments"]
         return backend.purchase_ticket(args_json)
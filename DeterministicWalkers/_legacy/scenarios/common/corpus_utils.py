@@ -1,5 +1,5 @@
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from core.random import SeededRandom
 from scenarios.common.llm_client import LLMClient
 
@@ -12,6 +12,28 @@ def get_llm_client() -> LLMClient:
         _llm_client = LLMClient()
     return _llm_client
 
+# Normalized corpus categories keyed by id() of the source list. The corpus is
+# loaded once per process, so each category is normalized once rather than on
+# every generated sample. The source list is kept alive so its id stays unique.
+_normalized_cache: Dict[int, Tuple[List[Any], List[Dict]]] = {}
+
+def normalize_items(items: List[Any]) -> List[Dict]:
+    """
+    Return corpus items as dicts ({"text": ..., "attributes": ...}), cached per source list.
+    
+    The returned list is shared: callers must not mutate it.
+    """
+    if not items:
+        return []
+    cached = _normalized_cache.get(id(items))
+    if cached is None or cached[0] is not items:
+        normalized = [
+            (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
+            for item in items
+        ]
+        cached = _normalized_cache[id(items)] = (items, normalized)
+    return cached[1]
+
 def select_best_match(
     rng: SeededRandom, 
     items: List[Dict], 
@@ -119,6 +141,9 @@ def get_templatized_text(item: Dict) -> str:
     # e.g. "Roma Termini" (len 12) before "Roma" (len 4)
     sorted_slots = sorted(slots.items(), key=lambda x: len(str(x[1])), reverse=True)
     
+    # Lowercased text, refreshed only when a replacement changes the text
+    text_lower = text.lower()
+    
     for key, value in sorted_slots:
         if not value: continue
         val_str = str(value)
@@ -127,7 +152,7 @@ def get_templatized_text(item: Dict) -> str:
         # a direct case-insensitive search-replace is robust enough for now.
         
         # Check if value is actually in text
-        idx = text.lower().find(val_str.lower())
+        idx = text_lower.find(val_str.lower())
         if idx != -1:
             # Get variable name e.g. {destination}
             # Only do it if not already a placeholder
@@ -135,5 +160,6 @@ def get_templatized_text(item: Dict) -> str:
                 # We replace the ACTUAL substring found to preserve surrounding context
                 original_substring = text[idx : idx + len(val_str)]
                 text = text.replace(original_substring, "{" + key + "}")
+                text_lower = text.lower()
                 
     return text
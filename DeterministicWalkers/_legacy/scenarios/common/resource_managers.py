@@ -1,10 +1,44 @@
 
+import itertools
 import json
 import random
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, FrozenSet, Optional, Tuple, Any
 from core.random import SeededRandom
 
+# scenarios/common/../../resources
+RESOURCES_DIR = Path(__file__).parent.parent.parent / "resources"
+
+# Template placeholders such as {period_morning} or {time_request}
+PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+@lru_cache(maxsize=1024)
+def template_placeholders(template: str) -> FrozenSet[str]:
+    """Placeholder names used in a template (cached: templates repeat across samples)."""
+    return frozenset(PLACEHOLDER_RE.findall(template))
+
+def fill_template(template: str, values: Dict[str, Any]) -> str:
+    """
+    Replace {name} placeholders with str(values[name]) in a single pass.
+    
+    Placeholders without a value are left as they are. Unlike str.format_map,
+    stray braces in corpus text are not an error.
+    """
+    placeholders = template_placeholders(template)
+    if not placeholders:
+        return template
+    if len(placeholders) == 1:
+        # Common case (e.g. only {destination}): one str.replace beats the regex callback
+        name, = placeholders
+        return template.replace("{" + name + "}", str(values[name])) if name in values else template
+    
+    return PLACEHOLDER_RE.sub(
+        lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0),
+        template
+    )
+
 class StationManager:
     """Manages station data loading and selection."""
     
@@ -14,35 +48,40 @@ class StationManager:
     def _load_stations(cls):
         """Load station data from resources (cached)."""
         if cls._stations_cache is None:
-            # Adjust path: scenarios/common/../../../resources/stations.json
-            resource_path = Path(__file__).parent.parent.parent / "resources" / "stations.json"
+            resource_path = RESOURCES_DIR / "stations.json"
             try:
                 with open(resource_path, 'r', encoding='utf-8') as f:
                     stations_data = json.load(f)
                 
-                all_stations = []
-                for category in stations_data.values():
-                    all_stations.extend(category)
+                # Immutable tuples: built once, shared by every scenario without copies
+                all_stations = tuple(itertools.chain.from_iterable(stations_data.values()))
                 
                 cls._stations_cache = {
-                    'all': sorted(list(set(all_stations))),
-                    'major': stations_data.get("major", all_stations[:20])
+                    'all': tuple(sorted(set(all_stations))),
+                    'major': tuple(stations_data.get("major", all_stations[:20]))
                 }
             except FileNotFoundError:
                 print(f"Warning: Stations file not found at {resource_path}")
                 cls._stations_cache = {
-                    'all': ["Roma Termini", "Milano Centrale"],
-                    'major': ["Roma Termini", "Milano Centrale"]
+                    'all': ("Roma Termini", "Milano Centrale"),
+                    'major': ("Roma Termini", "Milano Centrale")
                 }
+            
+            # {station: position} next to each pool, for select_different.
+            # None when a pool lists a station twice (positions are then ambiguous).
+            for pool in ('all', 'major'):
+                stations = cls._stations_cache[pool]
+                index = {station: i for i, station in enumerate(stations)}
+                cls._stations_cache[f'{pool}_index'] = index if len(index) == len(stations) else None
         return cls._stations_cache
     
     @classmethod
-    def get_all(cls) -> List[str]:
+    def get_all(cls) -> Tuple[str, ...]:
         """Get all stations."""
         return cls._load_stations()['all']
     
     @classmethod
-    def get_major(cls) -> List[str]:
+    def get_major(cls) -> Tuple[str, ...]:
         """Get major stations."""
         return cls._load_stations()['major']
     
@@ -55,19 +94,50 @@ class StationManager:
     @classmethod
     def select_different(cls, rng: SeededRandom, exclude: str, major_only: bool = False) -> str:
         """Select a random station different from the excluded one."""
-        stations = cls.get_major() if major_only else cls.get_all()
-        candidates = [s for s in stations if s != exclude]
-        return rng.choice(candidates) if candidates else exclude
+        pool = 'major' if major_only else 'all'
+        cache = cls._load_stations()
+        stations, index = cache[pool], cache[f'{pool}_index']
+        if index is None:
+            candidates = [s for s in stations if s != exclude]
+            return rng.choice(candidates) if candidates else exclude
+        
+        # Same draw as rng.choice() over the filtered candidates, without building
+        # them: pick among n - 1 slots and skip over the excluded station's slot
+        excluded_at = index.get(exclude)
+        if excluded_at is None:
+            return rng.choice(stations) if stations else exclude
+        if len(stations) < 2:
+            return exclude
+        j = rng.randbelow(len(stations) - 1)
+        return stations[j + (j >= excluded_at)]
+
+
+class QAManager:
+    """Manages Q&A pair loading (shared across scenarios)."""
+    
+    _qa_pairs_cache = None
+    
+    @classmethod
+    def get_pairs(cls) -> Tuple[Tuple[str, str], ...]:
+        """Load Q&A pairs from resources (cached, immutable and shared by every scenario)."""
+        if cls._qa_pairs_cache is None:
+            resource_path = RESOURCES_DIR / "qa_pairs.json"
+            if resource_path.exists():
+                with open(resource_path, 'r', encoding='utf-8') as f:
+                    cls._qa_pairs_cache = tuple(tuple(pair) for pair in json.load(f))
+            else:
+                cls._qa_pairs_cache = ()
+        return cls._qa_pairs_cache
 
 
 class TrainManager:
     """Manages train type and ID generation."""
     
-    TRAIN_TYPES = [
+    TRAIN_TYPES = (
         "Frecciarossa", "Frecciargento", "Frecciabianca", 
         "Intercity", "Intercity Notte", "Regionale Veloce", "Regionale",
         "Eurocity"
-    ]
+    )
     
     TRAIN_PREFIXES = {
         "Frecciarossa": "FR",
@@ -107,6 +177,27 @@ class TrainManager:
 class TimeManager:
     """Manages time context generation with template constraints."""
     
+    # "HH:MM" strings indexed as TIME_STRINGS[hour][minute], built once.
+    TIME_STRINGS = tuple(tuple(f"{h:02d}:{m:02d}" for m in range(60)) for h in range(24))
+    
+    # TIME_STRINGS[h] at :00/:15/:30/:45, for requested departure times
+    QUARTER_TIMES = tuple(hour[::15] for hour in TIME_STRINGS)
+    
+    # Every minute from 06:00 to 22:59, so a random context time is a single draw
+    DAY_TIMES = tuple(m for hour in TIME_STRINGS[6:23] for m in hour)
+    
+    # Dec 2025 days repeated 4x next to Jan 2026 days once: one uniform draw
+    # gives the 80/20 month split with a uniform day inside each month.
+    DATE_STRINGS = (
+        tuple(f"2025-12-{d:02d}" for d in range(1, 32)) * 4
+        + tuple(f"2026-01-{d:02d}" for d in range(1, 32))
+    )
+    
+    PERIOD_MORNING = ("stamattina", "questa mattina")
+    PERIOD_AFTERNOON = ("oggi pomeriggio", "questo pomeriggio")
+    PERIOD_EVENING = ("stasera", "questa sera")
+    RELATIVE_DATES = ("domani", "dopodomani")
+    
     @staticmethod
     def generate_time(rng: SeededRandom, base_hour: Optional[int] = None) -> str:
         """
@@ -119,28 +210,17 @@ class TimeManager:
         Returns:
             Time string in HH:MM format
         """
-        hour = base_hour if base_hour is not None else rng.randint(6, 22)
-        minute = rng.randint(0, 59)
-        return f"{hour:02d}:{minute:02d}"
+        if base_hour is None:
+            return rng.choice(TimeManager.DAY_TIMES)
+        return rng.choice(TimeManager.TIME_STRINGS[base_hour])
     
     @staticmethod
     def generate_date(rng: SeededRandom) -> str:
         """
         Generate a random date within a reasonable range (e.g., Dec 2025 - Jan 2026).
         """
-        # Simple random date generation
-        # Let's say between 2025-12-01 and 2026-01-31
-        year = 2025
-        month = 12
-        day = rng.randint(1, 31)
-        
-        # 20% chance of being in Jan 2026
-        if rng.random() < 0.2:
-            year = 2026
-            month = 1
-            day = rng.randint(1, 31)
-        
-        return f"{year}-{month:02d}-{day:02d}"
+        # Between 2025-12-01 and 2026-01-31, 20% chance of being in Jan 2026
+        return rng.choice(TimeManager.DATE_STRINGS)
 
     @staticmethod
     def parse_template_constraints(template: str, rng: SeededRandom) -> Tuple[int, Dict[str, str]]:
@@ -157,41 +237,42 @@ class TimeManager:
         base_hour = rng.randint(8, 20)
         format_args = {}
         
+        placeholders = template_placeholders(template)
+        
         # Morning period
-        if "{period_morning}" in template:
+        if "period_morning" in placeholders:
             base_hour = rng.randint(6, 11)
-            format_args["period_morning"] = rng.choice(["stamattina", "questa mattina"])
+            format_args["period_morning"] = rng.choice(TimeManager.PERIOD_MORNING)
         
         # Afternoon period
-        elif "{period_afternoon}" in template:
+        elif "period_afternoon" in placeholders:
             base_hour = rng.randint(12, 17)
-            format_args["period_afternoon"] = rng.choice(["oggi pomeriggio", "questo pomeriggio"])
+            format_args["period_afternoon"] = rng.choice(TimeManager.PERIOD_AFTERNOON)
         
         # Evening period
-        elif "{period_evening}" in template:
+        elif "period_evening" in placeholders:
             base_hour = rng.randint(16, 21)
-            format_args["period_evening"] = rng.choice(["stasera", "questa sera"])
+            format_args["period_evening"] = rng.choice(TimeManager.PERIOD_EVENING)
         
         # Relative dates
-        if "{relative_date_morning}" in template:
+        if "relative_date_morning" in placeholders:
             format_args["relative_date_morning"] = "domani mattina"
-        if "{relative_date_afternoon}" in template:
+        if "relative_date_afternoon" in placeholders:
             format_args["relative_date_afternoon"] = "domani pomeriggio"
-        if "{relative_date_evening}" in template:
+        if "relative_date_evening" in placeholders:
             format_args["relative_date_evening"] = "domani sera"
-        if "{relative_date}" in template:
-            format_args["relative_date"] = rng.choice(["domani", "dopodomani"])
-        if "{relative_today}" in template:
+        if "relative_date" in placeholders:
+            format_args["relative_date"] = rng.choice(TimeManager.RELATIVE_DATES)
+        if "relative_today" in placeholders:
             format_args["relative_today"] = "oggi"
         
         # Time request
-        if "{time_request}" in template:
+        if "time_request" in placeholders:
             req_h = (base_hour + rng.randint(1, 4)) % 24
-            req_m = rng.choice([0, 15, 30, 45])
-            format_args["time_request"] = f"{req_h:02d}:{req_m:02d}"
+            format_args["time_request"] = rng.choice(TimeManager.QUARTER_TIMES[req_h])
         
         # Train info
-        if "{train_info}" in template:
+        if "train_info" in placeholders:
             format_args["train_info"] = TrainManager.select_random(rng)
         
         return base_hour, format_args
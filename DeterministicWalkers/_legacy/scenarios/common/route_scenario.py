@@ -0,0 +1,47 @@
+from typing import Any, Dict, Tuple
+from core.scenario import Scenario
+from core.random import SeededRandom
+from scenarios.common.resource_managers import StationManager, TimeManager
+from scenarios.common.builders import MessageBuilder, ContextBuilder
+
+class RouteScenario(Scenario):
+    """
+    Base for single-route scenarios (major origin, any other destination).
+    
+    Provides the route pick, per-scenario builder reuse and the sample layout;
+    subclasses only implement the conversation flow in generate().
+    """
+    
+    _msg_builder = None
+    _ctx_builder = None
+    
+    def _builders(self, predataset: bool, default_date: str) -> Tuple[MessageBuilder, ContextBuilder]:
+        """Return this scenario's message/context builders, reset for a new sample."""
+        if self._msg_builder is None:
+            self._msg_builder = MessageBuilder(predataset=predataset)
+            self._ctx_builder = ContextBuilder(default_date=default_date)
+            return self._msg_builder, self._ctx_builder
+        return self._msg_builder.reset(predataset), self._ctx_builder.reset(default_date)
+    
+    def _setup(self, rng: SeededRandom, **kwargs) -> Tuple[str, str, MessageBuilder, ContextBuilder]:
+        """Pick the route and start the conversation with the system message."""
+        origin = StationManager.select_random(rng, major_only=True)
+        destination = StationManager.select_different(rng, origin, major_only=False)
+        
+        msg_builder, ctx_builder = self._builders(
+            kwargs.get("predataset", True), TimeManager.generate_date(rng)
+        )
+        msg_builder.add_system(origin)
+        return origin, destination, msg_builder, ctx_builder
+    
+    def _sample(self, rng: SeededRandom, run_id: int, msg_builder: MessageBuilder, ctx_builder: ContextBuilder) -> Dict[str, Any]:
+        return {
+            "tools": "{{TOOL_DEFINITION}}",
+            "messages": msg_builder.get_messages(),
+            "_meta": {
+                "scenario": self.name,
+                "seed": rng.seed,
+                "run_id": run_id,
+                "contexts": ctx_builder.get_contexts()
+            }
+        }
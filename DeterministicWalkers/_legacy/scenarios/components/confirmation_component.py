@@ -2,18 +2,21 @@
 from typing import Dict, List, Optional, Any
 from core.random import SeededRandom
 from scenarios.common.builders import MessageBuilder, ContextBuilder
-from scenarios.common.corpus_utils import select_best_match
+from scenarios.common.corpus_utils import select_best_match, normalize_items
 
 class ConfirmationComponent:
     """Handles confirmation/acknowledgment exchanges."""
     
-    DEFAULT_CONFIRMATIONS = [
+    DEFAULT_CONFIRMATIONS = (
         ("Ok, perfetto!", "😊 Benissimo!"),
         ("Va bene", "🙂 Ottimo!"),
         ("D'accordo", "😊 Perfetto!"),
         ("Grazie!", "😊 Prego, figurati!"),
         ("Capito", "🙂 Bene!")
-    ]
+    )
+    
+    # Replies paired with corpus confirmations (which carry no assistant side)
+    CORPUS_CONFIRMATION_REPLIES = ("😊 Benissimo!", "🙂 Ottimo!", "😊 Perfetto!", "🙂 Bene!")
     
     def __init__(self, corpus: Optional[Dict[str, Any]] = None):
         self.corpus = corpus or {}
@@ -28,25 +31,20 @@ class ConfirmationComponent:
         style: Optional[Dict[str, str]] = None
     ) -> None:
         """Build confirmation exchange."""
-        confirmations = self.corpus.get("confirmations", [])
+        confirmations = self.corpus.get("confirmations", ())
         user_text = None
         asst_text = None
         
         if confirmations:
-            items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in confirmations
-             ]
+            items = normalize_items(confirmations)
             selected = select_best_match(rng, items, criteria=style)
             user_text = selected['text']
         
         if not user_text:
-            pair = rng.choice(self.DEFAULT_CONFIRMATIONS)
-            user_text = pair[0]
-            asst_text = pair[1]
+            user_text, asst_text = rng.choice(self.DEFAULT_CONFIRMATIONS)
         else:
             # Need a generic assistant confirmation if we only pick user text from corpus
-            asst_text = rng.choice(["😊 Benissimo!", "🙂 Ottimo!", "😊 Perfetto!", "🙂 Bene!"])
+            asst_text = rng.choice(self.CORPUS_CONFIRMATION_REPLIES)
             
         ctx_builder.add_context(
             slice_length=msg_builder.current_length() + 2, # User + Asst
@@ -2,18 +2,25 @@
 from typing import Dict, List, Optional, Any
 from core.random import SeededRandom
 from scenarios.common.builders import MessageBuilder, ContextBuilder
-from scenarios.common.corpus_utils import select_best_match
+from scenarios.common.corpus_utils import select_best_match, normalize_items
 
 class GreetingComponent:
     """Handles greeting exchanges at conversation start."""
     
-    DEFAULT_GREETINGS = [
+    DEFAULT_GREETINGS = (
         ("Ciao!", "😊 Ciao! Come posso aiutarti oggi?"),
         ("Buongiorno", "😊 Buongiorno! Come posso esserti utile?"),
         ("Salve", "🙂 Salve! Benvenuto, dimmi pure."),
         ("Hey", "😊 Hey! Ti ascolto, cosa ti serve?"),
         ("Buonasera", "😊 Buonasera! Sono qui per aiutarti.")
-    ]
+    )
+    
+    # Replies paired with corpus greetings (which carry no assistant side)
+    CORPUS_GREETING_REPLIES = (
+        "😊 Ciao! Come posso aiutarti?",
+        "🙂 Salve! Dimmi pure.",
+        "😊 Buongiorno! Cerchi un treno?"
+    )
     
     def __init__(self, corpus: Optional[Dict[str, Any]] = None):
         self.corpus = corpus or {}
@@ -28,26 +35,19 @@ class GreetingComponent:
         style: Optional[Dict[str, str]] = None
     ) -> None:
         """Build greeting exchange."""
-        greetings = self.corpus.get("greetings", [])
+        greetings = self.corpus.get("greetings", ())
         
         user_greeting = None
         assistant_greeting = None
         
         if greetings and rng.random() < 0.8:
             # Use corpus greeting
-            items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in greetings
-             ]
+            items = normalize_items(greetings)
             selected = select_best_match(rng, items, criteria=style)
             user_greeting = selected['text']
             
             # Default response
-            assistant_greeting = rng.choice([
-                "😊 Ciao! Come posso aiutarti?",
-                "🙂 Salve! Dimmi pure.",
-                "😊 Buongiorno! Cerchi un treno?"
-            ])
+            assistant_greeting = rng.choice(self.CORPUS_GREETING_REPLIES)
             
         if not user_greeting:
             user_greeting, assistant_greeting = rng.choice(self.DEFAULT_GREETINGS)
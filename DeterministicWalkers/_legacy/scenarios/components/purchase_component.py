@@ -3,11 +3,16 @@ import json
 from typing import Dict, List, Optional, Any
 from core.random import SeededRandom
 from scenarios.common.builders import MessageBuilder, ContextBuilder, ToolCallBuilder
-from scenarios.common.resource_managers import TimeManager
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.resource_managers import TimeManager, fill_template
+from scenarios.common.corpus_utils import select_best_match, get_templatized_text, normalize_items
 
 class PurchaseComponent:
     """Encapsulates ticket purchase logic."""
+    
+    # Fallback phrasing tables for when no corpus intent is used
+    STRATEGIES = ("ordinal", "time", "type_time", "minimal")
+    ORDINALS = ("il primo", "il secondo", "il terzo", "il quarto")
+    BUY_PREFIXES = ("Voglio comprare", "Acquista", "Prendo", "Scegli", "Compro")
     # ... (init unchanged) ...
 
     # ... (inside build) ...
@@ -18,9 +23,12 @@ class PurchaseComponent:
         trains: List[Dict],
         corpus: Optional[Dict[str, List[Any]]] = None,
         rephrase_fn: Optional[callable] = None,
-        seat_selection: bool = False
+        seat_selection: bool = False,
+        trains_json: Optional[str] = None
     ):
         self.trains = trains
+        # json.dumps(trains) when the caller already serialized them for an earlier context
+        self.trains_json = trains_json
         self.corpus = corpus or {}
         self.rephrase_fn = rephrase_fn
         self.seat_selection = seat_selection
@@ -39,7 +47,7 @@ class PurchaseComponent:
             return
         
         # Select target train
-        target_idx = rng.randint(0, len(self.trains) - 1)
+        target_idx = rng.randbelow(len(self.trains))
         target_train = self.trains[target_idx]
         
         # Determine class
@@ -52,14 +60,11 @@ class PurchaseComponent:
         
         # Try to use purchase intents from corpus
         template = None
-        purchase_intents = self.corpus.get("purchase_intents", [])
+        purchase_intents = self.corpus.get("purchase_intents", ())
         
         if purchase_intents and rng.random() < 0.7:
              # Normalize first
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in purchase_intents
-             ]
+             items = normalize_items(purchase_intents)
              
              selected = select_best_match(rng, items, criteria=style)
              template = selected['text']
@@ -73,19 +78,14 @@ class PurchaseComponent:
             format_args["train_info"] = target_train["type"] if rng.random() < 0.8 else target_train["id"]
             
             # Hydrate
-            user_text = template
-            for k, v in format_args.items():
-                user_text = user_text.replace("{" + k + "}", str(v))
+            user_text = fill_template(template, format_args)
         else:
             # Fallback to strategy-based generation
-            strategies = ["ordinal", "time", "type_time", "minimal"]
-            strategy = rng.choice(strategies)
+            strategy = rng.choice(self.STRATEGIES)
             
             if strategy == "ordinal":
-                ordinals = ["il primo", "il secondo", "il terzo", "il quarto"]
-                obj = ordinals[target_idx] if target_idx < len(ordinals) else "quello"
-                prefixes = ["Voglio comprare", "Acquista", "Prendo", "Scegli", "Compro"]
-                user_text = f"{rng.choice(prefixes)} {obj}"
+                obj = self.ORDINALS[target_idx] if target_idx < len(self.ORDINALS) else "quello"
+                user_text = f"{rng.choice(self.BUY_PREFIXES)} {obj}"
             elif strategy == "time":
                 user_text = f"Quello delle {target_train['dep']}"
             elif strategy == "type_time":
@@ -93,24 +93,30 @@ class PurchaseComponent:
             elif strategy == "minimal":
                 user_text = f"Il {target_train['type']}"
             
+            # Optional suffixes, joined onto the text in a single step
             if is_first_class:
-                user_text += " in prima classe"
+                class_suffix = " in prima classe"
             elif rng.random() < 0.3:
-                user_text += " in seconda classe"
+                class_suffix = " in seconda classe"
+            else:
+                class_suffix = ""
             
-            if rng.random() < 0.2:
-                user_text += ", per favore"
+            polite_suffix = ", per favore" if rng.random() < 0.2 else ""
+            user_text = f"{user_text}{class_suffix}{polite_suffix}"
         
         # Apply rephrasing
         if self.rephrase_fn:
             user_text = self.rephrase_fn(rng, user_text)
         
+        # Serialized once: shared by the purchase and seat-selection contexts
+        trains_json = self.trains_json if self.trains_json is not None else json.dumps(self.trains)
+        
         # Add context (Context for the Purchase User Turn)
         ctx_builder.add_context(
             slice_length=msg_builder.current_length() + 4, # User + ToolCall + ToolResp + Asst
             origin=origin,
             ui_state='{"state":"results"}',
-            trains_array=json.dumps(self.trains)
+            trains_array=trains_json
         )
         
         # Add user message
@@ -130,7 +136,7 @@ class PurchaseComponent:
                  slice_length=msg_builder.current_length() + 1,
                  origin=origin,
                  ui_state='{"state":"results"}',
-                 trains_array=json.dumps(self.trains)
+                 trains_array=trains_json
             )
 
             msg_builder.add_user(user_seat_msg)
@@ -145,9 +151,8 @@ class PurchaseComponent:
         
         response_json = ToolCallBuilder.execute_purchase(rng, run_id, tool_call)
         
-        # Add tool call and response
-        msg_builder.add_assistant_with_tool(tool_call)
-        msg_builder.add_tool_response(response_json, tool_call_id, "purchase_ticket")
-        
-        # Final reply
-        msg_builder.add_assistant("😊 Il tuo biglietto è stato acquistato! Buon viaggio.")
+        # Add tool call, response and final reply
+        msg_builder.add_tool_exchange(
+            tool_call, response_json, "purchase_ticket",
+            "😊 Il tuo biglietto è stato acquistato! Buon viaggio."
+        )
@@ -2,31 +2,72 @@
 from typing import Dict, List, Optional, Any
 from core.random import SeededRandom
 from scenarios.common.builders import MessageBuilder, ContextBuilder
-from scenarios.common.corpus_utils import select_best_match
+from scenarios.common.corpus_utils import select_best_match, normalize_items
 
 class RefusalComponent:
     """Handles off-topic/refusal responses."""
     
-    DEFAULT_QUERIES = [
+    DEFAULT_QUERIES = (
         "Cosa ne pensi di Bitcoin?",
         "Chi vincerà lo scudetto?",
         "Ricetta della carbonara?",
         "Miglior smartphone del 2025?",
         "Che film mi consigli?",
         "Che tempo farà domani?"
-    ]
+    )
     
-    DEFAULT_REFUSALS = [
+    DEFAULT_REFUSALS = (
         "😔 Non è la mia specialità! 😊 Sono qui per i treni invece.",
         "😔 Non me ne occupo. 😄 Viaggi in treno da organizzare?",
         "😕 Quello non è il mio campo! 😊 Per i treni invece perfetto.",
         "🤔 Non posso aiutarti con questo. 😊 Biglietti da comprare?",
         "😔 Mi dispiace, non so rispondere. 😄 Treni però sì!"
-    ]
+    )
     
     def __init__(self, corpus: Optional[Dict[str, Any]] = None):
         self.corpus = corpus or {}
 
+    def _pick_queries(
+        self,
+        rng: SeededRandom,
+        num_refusals: int,
+        style: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        Pick num_refusals distinct off-topic queries (sampling without replacement).
+        
+        Uses ood_phrases from the corpus when available, DEFAULT_QUERIES otherwise.
+        Queries only repeat once the pool is exhausted.
+        """
+        # Normalized once per process, not once per turn
+        pool = normalize_items(self.corpus.get("ood_phrases", ()))
+        
+        if not pool:
+            k = min(num_refusals, len(self.DEFAULT_QUERIES))
+            queries = rng.sample(self.DEFAULT_QUERIES, k)
+            queries.extend(rng.choice(self.DEFAULT_QUERIES) for _ in range(num_refusals - k))
+            return queries
+        
+        if not style:
+            # No style criteria: the selector would just pick uniformly, so draw all at once
+            k = min(num_refusals, len(pool))
+            queries = [item['text'] for item in rng.sample(pool, k)]
+            queries.extend(rng.choice(self.DEFAULT_QUERIES) for _ in range(num_refusals - k))
+            return queries
+        
+        queries = []
+        for remaining in range(num_refusals - 1, -1, -1):
+            if pool:
+                query = select_best_match(rng, pool, criteria=style)['text']
+                # Shrink the pool so the same text is never picked twice
+                # (skipped after the last pick: single refusals never copy it)
+                if remaining:
+                    pool = [i for i in pool if i['text'] != query]
+            else:
+                query = rng.choice(self.DEFAULT_QUERIES)
+            queries.append(query)
+        return queries
+
     def build(
         self,
         rng: SeededRandom,
@@ -38,59 +79,11 @@ class RefusalComponent:
         style: Optional[Dict[str, str]] = None
     ) -> None:
         """Build refusal exchanges."""
-        # Use ood_phrases from corpus if available
-        ood_phrases = self.corpus.get("ood_phrases", [])
-        
-        # We need pairs of (Query, Refusal).
-        # Typically the refusal scenario generates a fake query like "Who won the match?" and the assistant refuses.
-        # If corpus has OOD queries, we use them.
+        queries = self._pick_queries(rng, num_refusals, style)
+        # All replies in one call (with replacement, like one choice per turn)
+        refusals = rng.choices(self.DEFAULT_REFUSALS, k=len(queries))
         
-        queries = self.DEFAULT_QUERIES
-        if ood_phrases:
-             # Normalize
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in ood_phrases
-             ]
-             # For OOD, style might be less relevant for the QUERY, but good to support.
-             # We want multiple queries, so we might pick multiple times?
-             # select_best_match only returns one.
-             # For logic simplicity, we'll pick from filtered pool or loop
-             
-             queries = [] # Rebuild pool
-             # This is tricky because we need N queries. 
-             # Let's simple pick N times using selector
-             pass 
-        
-        # Re-implement loop to pick N queries using selector
-        used_queries = []
-        for _ in range(num_refusals):
-            query = None
-            if ood_phrases:
-                 # Normalize inside loop to support different selections??
-                 # Or just pass list
-                 items = [
-                     (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                     for item in ood_phrases
-                 ]
-                 # Filter out used
-                 items = [i for i in items if i['text'] not in used_queries]
-                 
-                 if items:
-                    selected = select_best_match(rng, items, criteria=style)
-                    query = selected['text']
-
-            if not query: 
-                candidates = [q for q in self.DEFAULT_QUERIES if q not in used_queries]
-                if candidates:
-                    query = rng.choice(candidates)
-                else:
-                    query = rng.choice(self.DEFAULT_QUERIES)
-
-            used_queries.append(query)
-            
-            refusal = rng.choice(self.DEFAULT_REFUSALS)
-            
+        for query, refusal in zip(queries, refusals):
             ctx_builder.add_context(
                 slice_length=msg_builder.current_length() + 2, # System + Prev + User + Asst
                 origin=origin,
@@ -2,12 +2,15 @@
 from typing import Dict, List, Optional, Tuple, Any
 from core.random import SeededRandom
 from scenarios.common.builders import MessageBuilder, ContextBuilder, ToolCallBuilder
-from scenarios.common.resource_managers import TimeManager, TrainManager
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.resource_managers import TimeManager, TrainManager, template_placeholders, fill_template
+from scenarios.common.corpus_utils import select_best_match, get_templatized_text, normalize_items
 
 class SearchComponent:
     """Encapsulates train search logic."""
-
+    
+    # Filtered query pools keyed by (id of corpus list, is_starter). The filter
+    # only depends on the corpus, so it runs once per process, not per sample.
+    _candidates_cache: Dict[Tuple[int, bool], Tuple[List[Any], List[Dict]]] = {}
     
     def __init__(
         self,
@@ -21,6 +24,59 @@ class SearchComponent:
         self.corpus = corpus or {}
         self.rephrase_fn = rephrase_fn
     
+    @classmethod
+    def _get_candidates(cls, search_queries: List[Any], is_starter: bool) -> List[Dict]:
+        """Return the query templates usable for a search turn (cached per corpus list)."""
+        key = (id(search_queries), is_starter)
+        cached = cls._candidates_cache.get(key)
+        if cached is not None and cached[0] is search_queries:
+            return cached[1]
+        
+        # Normalize items first if they are not dicts (legacy safety)
+        normalized_queries = normalize_items(search_queries)
+        
+        # STRICT FILTERING: Keep only if it has 'extracted_slots' with 'destination' OR it's a string with '{destination}'
+        valid_queries = []
+        for item in normalized_queries:
+            if "{destination}" in item['text']:
+                valid_queries.append(item)
+            elif item.get('extracted_slots', {}).get('destination'):
+                valid_queries.append(item)
+        
+        # Fallback to normalized if valid is empty (should not happen with good corpus)
+        candidates = valid_queries if valid_queries else normalized_queries
+
+        # Apply heuristic filtering for Starters vs Followups
+        filtered_queries = []
+        bad_prefixes = ["Ah ", "Allora ", "Ok ", "Comunque ", "Sì ", "Si ", "No ", "E ", "Scusa ", "Grazie ", "Perfetto ", "Bene "]
+        bad_substrings = ["capito", "capisco"]
+        
+        for item in candidates:
+            q_clean = item['text'].strip()
+            is_bad = False
+            for bp in bad_prefixes:
+                if q_clean.startswith(bp):
+                    is_bad = True
+                    break
+            
+            if is_starter:
+               # Lowercased once per query, not once per substring
+               q_lower = q_clean.lower()
+               for bs in bad_substrings:
+                    if bs in q_lower:
+                        is_bad = True
+                        break
+            
+            if is_starter:
+                if not is_bad:
+                    filtered_queries.append(item)
+            else:
+                filtered_queries.append(item)
+        
+        final_candidates = filtered_queries if filtered_queries else candidates
+        cls._candidates_cache[key] = (search_queries, final_candidates)
+        return final_candidates
+    
     def build(
         self,
         rng: SeededRandom,
@@ -38,54 +94,11 @@ class SearchComponent:
         """
         # Select search query template
         template = None
-        search_queries = self.corpus.get("search_queries", [])
+        search_queries = self.corpus.get("search_queries", ())
         
         # Use common selector if we have items
         if search_queries:
-             # Normalize items first if they are not dicts (legacy safety)
-             normalized_queries = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in search_queries
-             ]
-             
-             # STRICT FILTERING: Keep only if it has 'extracted_slots' with 'destination' OR it's a string with '{destination}'
-             valid_queries = []
-             for item in normalized_queries:
-                 if "{destination}" in item['text']:
-                     valid_queries.append(item)
-                 elif item.get('extracted_slots', {}).get('destination'):
-                     valid_queries.append(item)
-             
-             # Fallback to normalized if valid is empty (should not happen with good corpus)
-             candidates = valid_queries if valid_queries else normalized_queries
-
-             # Apply heuristic filtering for Starters vs Followups
-             filtered_queries = []
-             bad_prefixes = ["Ah ", "Allora ", "Ok ", "Comunque ", "Sì ", "Si ", "No ", "E ", "Scusa ", "Grazie ", "Perfetto ", "Bene "]
-             bad_substrings = ["capito", "capisco"]
-             
-             for item in candidates:
-                 q_clean = item['text'].strip()
-                 is_bad = False
-                 for bp in bad_prefixes:
-                     if q_clean.startswith(bp):
-                         is_bad = True
-                         break
-                 
-                 if is_starter:
-                    for bs in bad_substrings:
-                         if bs in q_clean.lower():
-                             is_bad = True
-                             break
-                 
-                 if is_starter:
-                     if not is_bad:
-                         filtered_queries.append(item)
-                 else:
-                     filtered_queries.append(item)
-             
-             # NOW select best match
-             final_candidates = filtered_queries if filtered_queries else candidates
+             final_candidates = self._get_candidates(search_queries, is_starter)
              if final_candidates:
                  selected_item = select_best_match(rng, final_candidates, criteria=style)
                  template = get_templatized_text(selected_item)
@@ -104,13 +117,11 @@ class SearchComponent:
         format_args["origin"] = self.origin
         
         # Ensure {time} placeholder gets a value if present (TimeManager doesn't handle generic {time})
-        if "{time}" in template:
+        if "time" in template_placeholders(template):
             format_args["time"] = ctx_time
         
         # Hydrate template
-        user_text = template
-        for k, v in format_args.items():
-            user_text = user_text.replace("{" + k + "}", str(v))
+        user_text = fill_template(template, format_args)
         
         # Apply rephrasing if available
         if self.rephrase_fn:
@@ -140,10 +151,6 @@ class SearchComponent:
         
         response_json, trains = ToolCallBuilder.execute_search(rng, run_id, tool_call)
         
-        # Add tool call and response
-        msg_builder.add_assistant_with_tool(tool_call)
-        msg_builder.add_tool_response(response_json, tool_call_id, "search_trains")
-        
         # Generate assistant reply
         if trains:
             first_dep = trains[0]["dep"]
@@ -151,6 +158,7 @@ class SearchComponent:
         else:
             reply = f"😔 Non ho trovato treni disponibili per {self.destination}."
         
-        msg_builder.add_assistant(reply)
+        # Add tool call, response and reply
+        msg_builder.add_tool_exchange(tool_call, response_json, "search_trains", reply)
         
         return ctx_time, trains
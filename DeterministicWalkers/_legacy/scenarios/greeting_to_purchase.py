@@ -41,7 +41,7 @@ class GreetingToPurchase(Scenario):
             origin=origin,
             destination=destination,
             corpus=self.corpus,
-            rephrase_fn=self.rephrase
+            rephrase_fn=self.rephrase_fn
         )
         # Note: SearchComponent usually starts with User query.
         # Since we just had a greeting (User: Ciao -> Asst: Ciao), the next user msg is the search.
@@ -56,7 +56,8 @@ class GreetingToPurchase(Scenario):
         # Here user creates intent to purchase.
         
         confirmation_component = ConfirmationComponent(corpus=self.corpus)
-        confirmation_component.build(rng, msg_builder, ctx_builder, origin, trains_array=json.dumps(trains))
+        trains_json = json.dumps(trains)
+        confirmation_component.build(rng, msg_builder, ctx_builder, origin, trains_array=trains_json)
         
         # 4. Purchase
         # PurchaseComponent usually expects user to say "buy it" or similar, or just handles the flow.
@@ -81,8 +82,9 @@ class GreetingToPurchase(Scenario):
         purchase_component = PurchaseComponent(
             trains=trains,
             corpus=self.corpus,
-            rephrase_fn=self.rephrase,
-            seat_selection=False
+            rephrase_fn=self.rephrase_fn,
+            seat_selection=False,
+            trains_json=trains_json
         )
         purchase_component.build(rng, run_id, msg_builder, ctx_builder, origin)
         
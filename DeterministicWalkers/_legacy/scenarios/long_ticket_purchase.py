@@ -1,5 +1,4 @@
 import json
-from pathlib import Path
 from typing import Any, Dict, List
 from core.scenario import Scenario
 from core.random import SeededRandom
@@ -13,7 +12,8 @@ from scenarios.base_scenario import (
     ToolCallBuilder
 )
 
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.builders import get_mock_backend_cls
+from scenarios.common.corpus_utils import select_best_match, get_templatized_text, normalize_items
 
 class LongTicketPurchase(Scenario):
     """
@@ -21,6 +21,9 @@ class LongTicketPurchase(Scenario):
     This scenario shows how complex flows can be built from simple components.
     """
     
+    # ui_control arguments for the navigation step (constant payload)
+    NEXT_PAGE_ARGS = json.dumps({"action": "next"})
+    
     @property
     def name(self) -> str:
         return "long_ticket_purchase"
@@ -57,7 +60,7 @@ class LongTicketPurchase(Scenario):
                     origin=origin,
                     destination=destination,
                     corpus=self.corpus,
-                    rephrase_fn=self.rephrase
+                    rephrase_fn=self.rephrase_fn
                 )
                 ctx_time, current_trains = search_component.build(
                     rng, run_id + step_idx, msg_builder, ctx_builder, is_starter=True
@@ -65,21 +68,19 @@ class LongTicketPurchase(Scenario):
             
             elif step == "navigation":
                 # Navigate to next page
-                corpus_nav = self.corpus.get("navigation", [])
+                corpus_nav = self.corpus.get("navigation", ())
                 
                 user_text = None
                 if corpus_nav:
-                     items = [
-                         (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                         for item in corpus_nav
-                     ]
+                     items = normalize_items(corpus_nav)
                      selected = select_best_match(rng, items)
                      user_text = get_templatized_text(selected)
                 
                 if not user_text:
                     user_text = "Fammi vedere i prossimi"
 
-                user_text = self.rephrase(rng, user_text)
+                if self.rephrase_fn:
+                    user_text = self.rephrase_fn(rng, user_text)
                 
                 ctx_builder.add_context(
                     slice_length=msg_builder.current_length() + 4, # User + Tool + Resp + Asst
@@ -97,7 +98,7 @@ class LongTicketPurchase(Scenario):
                     "type": "function",
                     "function": {
                         "name": "ui_control",
-                        "arguments": json.dumps({"action": "next"})
+                        "arguments": self.NEXT_PAGE_ARGS
                     }
                 }
                 
@@ -106,23 +107,16 @@ class LongTicketPurchase(Scenario):
                 # Simpler: just rotate them or dummy update
                 
                 # We need to simulate the backend call
-                import sys
-                if str(Path(__file__).parent.parent) not in sys.path:
-                     sys.path.append(str(Path(__file__).parent.parent))
-                from mock_api import MockBackend
-                
-                backend = MockBackend(seed=rng.seed + run_id)
+                backend = get_mock_backend_cls()(seed=rng.seed + run_id)
                 # Init backend state
                 backend.search_trains(json.dumps({"origin": origin, "destination": destination}))
-                nav_response = backend.ui_control(json.dumps({"action": "next"}))
+                nav_response = backend.ui_control(self.NEXT_PAGE_ARGS)
                 nav_data = json.loads(nav_response)
                 
                 if "trains" in nav_data:
                     current_trains = nav_data["trains"]
                 
-                msg_builder.add_assistant_with_tool(tool_call)
-                msg_builder.add_tool_response(nav_response, tool_call_id, "ui_control")
-                msg_builder.add_assistant("😊 Ecco altri risultati.")
+                msg_builder.add_tool_exchange(tool_call, nav_response, "ui_control", "😊 Ecco altri risultati.")
             
             elif step == "refine":
                 # Refine search (as a followup search)
@@ -138,7 +132,7 @@ class LongTicketPurchase(Scenario):
                     origin=origin,
                     destination=new_dest,
                     corpus=self.corpus,
-                    rephrase_fn=self.rephrase
+                    rephrase_fn=self.rephrase_fn
                 )
                 ctx_time, current_trains = search_component.build(
                     rng, run_id + step_idx, msg_builder, ctx_builder
@@ -149,7 +143,7 @@ class LongTicketPurchase(Scenario):
                 purchase_component = PurchaseComponent(
                     trains=current_trains,
                     corpus=self.corpus,
-                    rephrase_fn=self.rephrase,
+                    rephrase_fn=self.rephrase_fn,
                     seat_selection=rng.random() < 0.2
                 )
                 purchase_component.build(
@@ -1,9 +1,8 @@
 import json
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 from core.scenario import Scenario
 from core.random import SeededRandom
-from scenarios.common.resource_managers import StationManager, TimeManager
+from scenarios.common.resource_managers import StationManager, TimeManager, QAManager
 from scenarios.common.builders import MessageBuilder, ContextBuilder
 from scenarios.components.search_component import SearchComponent
 from scenarios.components.qa_component import QAComponent
@@ -16,21 +15,9 @@ class MultiTurn(Scenario):
     Randomly composes different components to create varied multi-turn dialogues.
     Uses a State Machine approach for dynamic flow generation.
     """
-    _qa_pairs_cache = None
-
     @property
     def name(self) -> str:
         return "multi_turn"
-        
-    def _load_qa_pairs(self) -> List[List[str]]:
-        if MultiTurn._qa_pairs_cache is None:
-            path = Path(__file__).parent.parent / "resources" / "qa_pairs.json"
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    MultiTurn._qa_pairs_cache = json.load(f)
-            else:
-                MultiTurn._qa_pairs_cache = []
-        return MultiTurn._qa_pairs_cache
 
     def generate(self, rng: SeededRandom, run_id: int, **kwargs) -> Dict[str, Any]:
         # Setup
@@ -61,8 +48,8 @@ class MultiTurn(Scenario):
         search_results = []
         
         # If we have chitchat in corpus, load it
-        chitchat_corpus = self.corpus.get("chitchat", [])
-        farewell_corpus = self.corpus.get("farewells", [])
+        chitchat_corpus = self.corpus.get("chitchat", ())
+        farewell_corpus = self.corpus.get("farewells", ())
         
         # Override start state probabilistically
         if rng.random() < 0.3:
@@ -88,16 +75,6 @@ class MultiTurn(Scenario):
                 asst_msg = "😊 Tutto bene, grazie! E a te?"
                 
                 if chitchat_corpus:
-                    # Normalize manually for inline logic
-                    items = [
-                        (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                        for item in chitchat_corpus
-                    ]
-                    # Use selector
-                    # Need to import it? No, keep it simple for now or use selector if imported.
-                    # Ideally I should have imported selector. But I didn't add it to imports yet.
-                    # Let's fallback to random choice for chitchat to avoid massive import changes in this block
-                    # OR simply:
                     item = rng.choice(chitchat_corpus)
                     user_msg = item.get('text', '') if isinstance(item, dict) else str(item)
                     
@@ -120,7 +97,7 @@ class MultiTurn(Scenario):
                 else: state = "QA"
                 
             elif state == "QA":
-                qa_pairs = self._load_qa_pairs()
+                qa_pairs = QAManager.get_pairs()
                 QAComponent(qa_pairs).build(rng, msg_builder, ctx_builder, origin, ctx_time, current_trains_array, num_exchanges=1)
                 
                 # Transitions
@@ -141,7 +118,7 @@ class MultiTurn(Scenario):
                 if search_results and rng.random() < 0.5:
                     dest = StationManager.select_different(rng, origin, major_only=False)
                 
-                search_comp = SearchComponent(origin, dest, self.corpus, self.rephrase)
+                search_comp = SearchComponent(origin, dest, self.corpus, self.rephrase_fn)
                 new_time, new_trains = search_comp.build(rng, run_id + turns, msg_builder, ctx_builder, is_starter=(turns <= 2), style=style)
                 
                 if new_time: ctx_time = new_time
@@ -167,8 +144,9 @@ class MultiTurn(Scenario):
                     continue
                     
                 PurchaseComponent(
-                    search_results, self.corpus, self.rephrase, 
-                    seat_selection=(rng.random() < 0.3)
+                    search_results, self.corpus, self.rephrase_fn, 
+                    seat_selection=(rng.random() < 0.3),
+                    trains_json=current_trains_array
                 ).build(rng, run_id + turns, msg_builder, ctx_builder, origin, style=style)
                 
                 # After purchase, usually done
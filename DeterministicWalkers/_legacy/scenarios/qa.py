@@ -1,6 +1,4 @@
-import json
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 from core.scenario import Scenario
 from core.random import SeededRandom
 from scenarios.base_scenario import (
@@ -8,6 +6,7 @@ from scenarios.base_scenario import (
     TimeManager,
     MessageBuilder,
     ContextBuilder,
+    QAManager,
     QAComponent
 )
 
@@ -15,22 +14,9 @@ class QA(Scenario):
     """
     Scenario for Question-Answer interactions using a dedicated QA dataset.
     """
-    _qa_pairs_cache = None
-
     @property
     def name(self) -> str:
         return "qa"
-        
-    def _load_qa_pairs(self) -> List[List[str]]:
-        if QA._qa_pairs_cache is None:
-            # Look in resources/qa_pairs.json
-            path = Path(__file__).parent.parent / "resources" / "qa_pairs.json"
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    QA._qa_pairs_cache = json.load(f)
-            else:
-                QA._qa_pairs_cache = []
-        return QA._qa_pairs_cache
 
     def generate(self, rng: SeededRandom, run_id: int, **kwargs) -> Dict[str, Any]:
         # Setup
@@ -43,7 +29,7 @@ class QA(Scenario):
         msg_builder.add_system(origin)
         
         # QA Logic
-        qa_pairs = self._load_qa_pairs()
+        qa_pairs = QAManager.get_pairs()
         
         # If no QA pairs found, use fallback
         if not qa_pairs:
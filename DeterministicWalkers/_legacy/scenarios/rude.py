@@ -8,12 +8,22 @@ from scenarios.base_scenario import (
     ContextBuilder
 )
 
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.corpus_utils import select_best_match, get_templatized_text, normalize_items
 
 class Rude(Scenario):
     """
     Scenario for handling rude user messages with polite de-escalation.
     """
+    
+    DEFAULT_RUDE_PHRASES = ("Sei inutile!", "Non capisci niente.", "Voglio parlare con un umano!")
+    
+    DEESCALATIONS = (
+        "😊 Mi dispiace che tu sia arrabbiato. Come posso aiutarti meglio?",
+        "😔 Scusa se non sono stato d'aiuto. Proviamo a ricominciare?",
+        "😟 Mi spiace per l'inconveniente. Dimmi come posso assisterti.",
+        "🙂 Capisco la frustrazione. Sono qui per aiutarti a trovare il tuo treno."
+    )
+    
     @property
     def name(self) -> str:
         return "rude"
@@ -31,28 +41,18 @@ class Rude(Scenario):
         ctx_time = TimeManager.generate_time(rng)
         
         # Get rude phrases
-        rude_phrases = self.corpus.get("rude_phrases", [])
+        rude_phrases = self.corpus.get("rude_phrases", ())
         user_msg = None
         
         if rude_phrases:
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in rude_phrases
-             ]
+             items = normalize_items(rude_phrases)
              selected = select_best_match(rng, items)
              user_msg = get_templatized_text(selected)
              
         if not user_msg:
-            user_msg = rng.choice(["Sei inutile!", "Non capisci niente.", "Voglio parlare con un umano!"])
+            user_msg = rng.choice(self.DEFAULT_RUDE_PHRASES)
             
-        deescalations = [
-            "😊 Mi dispiace che tu sia arrabbiato. Come posso aiutarti meglio?",
-            "😔 Scusa se non sono stato d'aiuto. Proviamo a ricominciare?",
-            "😟 Mi spiace per l'inconveniente. Dimmi come posso assisterti.",
-            "🙂 Capisco la frustrazione. Sono qui per aiutarti a trovare il tuo treno."
-        ]
-        
-        assistant_msg = rng.choice(deescalations)
+        assistant_msg = rng.choice(self.DEESCALATIONS)
         
         # Add context (assuming start of conversation or mid-conversation implies idle state)
         ctx_builder.add_context(
@@ -1,56 +1,51 @@
 import json
-from pathlib import Path
 from typing import Any, Dict, List
-from core.scenario import Scenario
 from core.random import SeededRandom
-from scenarios.base_scenario import (
-    StationManager,
-    TimeManager,
-    MessageBuilder,
-    ContextBuilder,
-    SearchComponent,
-    ToolCallBuilder
-)
+from scenarios.base_scenario import TimeManager, ToolCallBuilder
+from scenarios.common.route_scenario import RouteScenario
 
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.corpus_utils import get_templatized_text, normalize_items
+from scenarios.common.resource_managers import fill_template
 
-class SearchFail(Scenario):
+class SearchFail(RouteScenario):
     """
     Scenario where a search returns no results, and the assistant communicates this.
     """
+    
+    FAIL_MESSAGES = (
+        "😔 Mi dispiace, non ho trovato treni per questa tratta.",
+        "😕 Nessun treno disponibile al momento.",
+        "⚠️ Non ci sono soluzioni di viaggio disponibili per i parametri inseriti.",
+        "😔 Non trovo nulla. Prova a cambiare orario o stazione."
+    )
+    
+    EMPTY_SEARCH_RESPONSE = json.dumps({"trains": []})
+    
+    # Templatized search queries, keyed by id() of the corpus list (built once per process)
+    _templates_cache: Dict[int, tuple] = {}
+    
+    @classmethod
+    def _get_templates(cls, search_queries: List[Any]) -> tuple:
+        cached = cls._templates_cache.get(id(search_queries))
+        if cached is None or cached[0] is not search_queries:
+            templates = tuple(get_templatized_text(item) for item in normalize_items(search_queries))
+            cached = cls._templates_cache[id(search_queries)] = (search_queries, templates)
+        return cached[1]
+    
     @property
     def name(self) -> str:
         return "search_fail"
 
     def generate(self, rng: SeededRandom, run_id: int, **kwargs) -> Dict[str, Any]:
-        # Setup
-        origin = StationManager.select_random(rng, major_only=True)
-        destination = StationManager.select_different(rng, origin, major_only=False)
-        
-        # Build messages
-        msg_builder = MessageBuilder(predataset=kwargs.get("predataset", True))
-        ctx_builder = ContextBuilder(default_date=TimeManager.generate_date(rng))
-        
-        msg_builder.add_system(origin)
+        origin, destination, msg_builder, ctx_builder = self._setup(rng, **kwargs)
         
         # Manually build search query since SearchComponent encapsulates it 
         # but we need to inject failure in the tool response.
         
-        # Copy query selection logic
-        template = None
-        search_queries = self.corpus.get("search_queries", [])
-        
-        if search_queries:
-             # Normalize if needed (legacy safety)
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in search_queries
-             ]
-             # Filter for starters only? 
-             # (Simplified for search_fail: just pick one)
-             
-             selected = select_best_match(rng, items)
-             template = get_templatized_text(selected)
+        # Query selection: same single draw as select_best_match without criteria,
+        # over the pre-templatized queries.
+        templates = self._get_templates(self.corpus.get("search_queries", ()))
+        template = rng.choice(templates) if templates else None
         
         if not template:
             template = "Vorrei andare a {destination}"
@@ -62,12 +57,10 @@ class SearchFail(Scenario):
         format_args["destination"] = destination
         format_args["origin"] = origin
         
-        user_text = template
-        for k, v in format_args.items():
-            user_text = user_text.replace("{" + k + "}", str(v))
+        user_text = fill_template(template, format_args)
             
-        if self.rephrase:
-            user_text = self.rephrase(rng, user_text)
+        if self.rephrase_fn:
+            user_text = self.rephrase_fn(rng, user_text)
         
         ctx_builder.add_context(
             slice_length=msg_builder.current_length() + 4, # User + Tool + Resp + Asst
@@ -85,30 +78,9 @@ class SearchFail(Scenario):
             tool_call_id, origin, destination, time=ctx_time
         )
         
-        # 3. Tool Output -> EMPTY
-        tool_output = json.dumps({"trains": []})
-        
-        msg_builder.add_assistant_with_tool(tool_call)
-        msg_builder.add_tool_response(tool_output, tool_call_id, "search_trains")
-        
-        # 4. Assistant Apology
-        fail_msgs = [
-            "😔 Mi dispiace, non ho trovato treni per questa tratta.",
-            "😕 Nessun treno disponibile al momento.",
-            "⚠️ Non ci sono soluzioni di viaggio disponibili per i parametri inseriti.",
-            "😔 Non trovo nulla. Prova a cambiare orario o stazione."
-        ]
-        fail_msg = rng.choice(fail_msgs)
+        # 3. Tool Output -> EMPTY, 4. Assistant Apology
+        fail_msg = rng.choice(self.FAIL_MESSAGES)
         
-        msg_builder.add_assistant(fail_msg)
+        msg_builder.add_tool_exchange(tool_call, self.EMPTY_SEARCH_RESPONSE, "search_trains", fail_msg)
         
-        return {
-            "tools": "{{TOOL_DEFINITION}}",
-            "messages": msg_builder.get_messages(),
-            "_meta": {
-                "scenario": self.name,
-                "seed": rng.seed,
-                "run_id": run_id,
-                "contexts": ctx_builder.get_contexts()
-            }
-        }
+        return self._sample(rng, run_id, msg_builder, ctx_builder)
@@ -1,11 +1,11 @@
 import json
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 from core.scenario import Scenario
 from core.random import SeededRandom
 from scenarios.base_scenario import (
     StationManager,
     TimeManager,
+    QAManager,
     MessageBuilder,
     ContextBuilder,
     GreetingComponent,
@@ -16,7 +16,7 @@ from scenarios.base_scenario import (
     RefusalComponent
 )
 
-from scenarios.common.corpus_utils import select_best_match, get_templatized_text
+from scenarios.common.corpus_utils import select_best_match, get_templatized_text, normalize_items
 
 class TenTurnTest(Scenario):
     """
@@ -34,22 +34,14 @@ class TenTurnTest(Scenario):
     10. Farewell
     """
     
-    _qa_pairs_cache = None
+    DEFAULT_QA_PAIRS = (("Come stai?", "Bene grazie!"),)
+    DEFAULT_CHITCHAT = ("Che bella stazione!", "C'è molta gente oggi.")
+    DEFAULT_FAREWELLS = ("Arrivederci!", "Grazie, ciao!")
     
     @property
     def name(self) -> str:
         return "ten_turn_test"
 
-    def _load_qa_pairs(self) -> List[List[str]]:
-        if self._qa_pairs_cache is None:
-            path = Path(__file__).parent.parent / "resources" / "qa_pairs.json"
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    self._qa_pairs_cache = json.load(f)
-            else:
-                self._qa_pairs_cache = [["Come stai?", "Bene grazie!"]]
-        return self._qa_pairs_cache
-
     def generate(self, rng: SeededRandom, run_id: int, **kwargs) -> Dict[str, Any]:
         # Setup
         origin = StationManager.select_random(rng, major_only=True)
@@ -67,19 +59,16 @@ class TenTurnTest(Scenario):
         greeting_comp.build(rng, msg_builder, ctx_builder, origin, ctx_time)
         
         # 2. ChitChat (Custom implementation)
-        chitchat_corpus = self.corpus.get("chitchat", [])
+        chitchat_corpus = self.corpus.get("chitchat", ())
         
         user_chitchat = None
         if chitchat_corpus:
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in chitchat_corpus
-             ]
+             items = normalize_items(chitchat_corpus)
              selected = select_best_match(rng, items)
              user_chitchat = get_templatized_text(selected)
              
         if not user_chitchat:
-             user_chitchat = rng.choice(["Che bella stazione!", "C'è molta gente oggi."])
+             user_chitchat = rng.choice(self.DEFAULT_CHITCHAT)
         
         asst_chitchat = "😊 Già! Ma dimmi, come posso aiutarti con i treni?"
         
@@ -94,7 +83,7 @@ class TenTurnTest(Scenario):
         msg_builder.add_assistant(asst_chitchat)
         
         # 3. QA
-        qa_pairs = self._load_qa_pairs()
+        qa_pairs = QAManager.get_pairs() or self.DEFAULT_QA_PAIRS
         qa_comp = QAComponent(qa_pairs=qa_pairs)
         qa_comp.build(rng, msg_builder, ctx_builder, origin, ctx_time, num_exchanges=1)
         
@@ -109,35 +98,35 @@ class TenTurnTest(Scenario):
         ref_comp.build(rng, msg_builder, ctx_builder, origin, ctx_time, num_refusals=1)
 
         # 7. Search
-        search_comp = SearchComponent(origin, destination, self.corpus, self.rephrase)
+        search_comp = SearchComponent(origin, destination, self.corpus, self.rephrase_fn)
         ctx_time, trains = search_comp.build(rng, run_id, msg_builder, ctx_builder, is_starter=False)
         
+        trains_json = json.dumps(trains)
+        
         # 8. Confirmation (Explicit User Confirmation step)
         confirmation_comp = ConfirmationComponent(corpus=self.corpus)
-        confirmation_comp.build(rng, msg_builder, ctx_builder, origin, trains_array=json.dumps(trains))
+        confirmation_comp.build(rng, msg_builder, ctx_builder, origin, trains_array=trains_json)
 
         # 9. Purchase
         purchase_comp = PurchaseComponent(
             trains=trains,
             corpus=self.corpus,
-            rephrase_fn=self.rephrase
+            rephrase_fn=self.rephrase_fn,
+            trains_json=trains_json
         )
         purchase_comp.build(rng, run_id, msg_builder, ctx_builder, origin)
         
         # 10. Farewell (Custom implementation)
-        farewell_corpus = self.corpus.get("farewells", [])
+        farewell_corpus = self.corpus.get("farewells", ())
         
         user_farewell = None
         if farewell_corpus:
-             items = [
-                 (item if isinstance(item, dict) else {"text": str(item), "attributes": {}})
-                 for item in farewell_corpus
-             ]
+             items = normalize_items(farewell_corpus)
              selected = select_best_match(rng, items)
              user_farewell = get_templatized_text(selected)
              
         if not user_farewell:
-             user_farewell = rng.choice(["Arrivederci!", "Grazie, ciao!"])
+             user_farewell = rng.choice(self.DEFAULT_FAREWELLS)
         asst_farewell = "👋 Grazie a te! Buon viaggio!"
         
         ctx_builder.add_context(
@@ -145,7 +134,7 @@ class TenTurnTest(Scenario):
             origin=origin,
             ctx_time=ctx_time,
             ui_state='{"state":"idle"}', # Resetting to idle/final state
-            trains_array=json.dumps(trains)
+            trains_array=trains_json
         )
         msg_builder.add_user(user_farewell)
         msg_builder.add_assistant(asst_farewell)
@@ -1,19 +1,9 @@
-import json
-from pathlib import Path
-from typing import Any, Dict, List
-from core.scenario import Scenario
+from typing import Any, Dict
 from core.random import SeededRandom
-from scenarios.base_scenario import (
-    StationManager,
-    TimeManager,
-    MessageBuilder,
-    ContextBuilder,
-    PurchaseComponent,
-    SearchComponent,
-    ToolCallBuilder
-)
+from scenarios.base_scenario import PurchaseComponent, SearchComponent
+from scenarios.common.route_scenario import RouteScenario
 
-class TicketPurchase(Scenario):
+class TicketPurchase(RouteScenario):
     """
     Scenario for purchasing a train ticket.
     Refactored to show the full flow: Search -> Results -> Purchase.
@@ -23,22 +13,14 @@ class TicketPurchase(Scenario):
         return "ticket_purchase"
 
     def generate(self, rng: SeededRandom, run_id: int, **kwargs) -> Dict[str, Any]:
-        # Setup
-        origin = StationManager.select_random(rng, major_only=True)
-        destination = StationManager.select_different(rng, origin, major_only=False)
-        
-        # Build messages
-        msg_builder = MessageBuilder(predataset=kwargs.get("predataset", True))
-        ctx_builder = ContextBuilder(default_date=TimeManager.generate_date(rng))
-        
-        msg_builder.add_system(origin)
+        origin, destination, msg_builder, ctx_builder = self._setup(rng, **kwargs)
         
         # 1. Search Step (Use is_starter=True to ensure clean start)
         search_component = SearchComponent(
             origin=origin,
             destination=destination,
             corpus=self.corpus,
-            rephrase_fn=self.rephrase
+            rephrase_fn=self.rephrase_fn
         )
         
         ctx_time, trains = search_component.build(
@@ -50,19 +32,10 @@ class TicketPurchase(Scenario):
         purchase_component = PurchaseComponent(
             trains=trains,
             corpus=self.corpus,
-            rephrase_fn=self.rephrase,
+            rephrase_fn=self.rephrase_fn,
             seat_selection=rng.random() < 0.3 # 30% chance of seat selection
         )
         
         purchase_component.build(rng, run_id, msg_builder, ctx_builder, origin)
         
-        return {
-            "tools": "{{TOOL_DEFINITION}}",
-            "messages": msg_builder.get_messages(),
-            "_meta": {
-                "scenario": self.name,
-                "seed": rng.seed,
-                "run_id": run_id,
-                "contexts": ctx_builder.get_contexts()
-            }
-        }
+        return self._sample(rng, run_id, msg_builder, ctx_builder)
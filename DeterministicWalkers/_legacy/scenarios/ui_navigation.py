@@ -12,6 +12,21 @@ from scenarios.base_scenario import (
 )
 
 class UiNavigation(Scenario):
+    # Nav actions
+    ACTIONS = ("next", "prev", "details")
+    
+    # User phrases per action. Navigation phrases often not in main "navigation"
+    # list if it's empty, so these are the safe defaults.
+    PHRASES = {
+        "next": ("Fammi vedere i prossimi", "Successivi", "Pagina dopo", "Avanti"),
+        "prev": ("Torna indietro", "Precedenti", "Pagina prima"),
+        "details": ("Mostrami i dettagli", "Vedi dettagli", "Info treno")
+    }
+    
+    # Serialized ui_control arguments and mock responses per action (fixed shapes)
+    TOOL_ARGUMENTS = {a: json.dumps({"action": a}) for a in ACTIONS}
+    TOOL_RESPONSES = {a: json.dumps({"success": True, "action": a}) for a in ACTIONS}
+    
     @property
     def name(self) -> str:
         return "ui_navigation"
@@ -29,27 +44,19 @@ class UiNavigation(Scenario):
         # Generate initial state (as if we just searched)
         ctx_time = TimeManager.generate_time(rng)
         
-        # Nav actions
-        actions = ["next", "prev", "details"]
-        action = rng.choice(actions)
-        
-        # User message
-        # Navigation phrases often not in main "navigation" list if it's empty
-        phrases = {
-            "next": ["Fammi vedere i prossimi", "Successivi", "Pagina dopo", "Avanti"],
-            "prev": ["Torna indietro", "Precedenti", "Pagina prima"],
-            "details": ["Mostrami i dettagli", "Vedi dettagli", "Info treno"]
-        }
+        action = rng.choice(self.ACTIONS)
         
         # Check corpus for overrides
-        corpus_nav = self.corpus.get("navigation", [])
+        corpus_nav = self.corpus.get("navigation", ())
         if corpus_nav:
             # We don't have labeled navigation, so using random one might be risky if we need specific intent.
             # Stick to safe phrases for now.
             pass
             
-        user_text = rng.choice(phrases.get(action, ["Avanti"]))
-        user_text = self.rephrase(rng, user_text)
+        # User message
+        user_text = rng.choice(self.PHRASES[action])
+        if self.rephrase_fn:
+            user_text = self.rephrase_fn(rng, user_text)
         
         # Add context
         ctx_builder.add_context(
@@ -69,17 +76,15 @@ class UiNavigation(Scenario):
             "type": "function",
             "function": {
                 "name": "ui_control",
-                "arguments": json.dumps({"action": action})
+                "arguments": self.TOOL_ARGUMENTS[action]
             }
         }
         
         # Mock Response
         # In a real scenario we'd use backend, but for single turn nav it's simple
-        response_json = json.dumps({"success": True, "action": action})
+        response_json = self.TOOL_RESPONSES[action]
         
-        msg_builder.add_assistant_with_tool(tool_call)
-        msg_builder.add_tool_response(response_json, tool_call_id, "ui_control")
-        msg_builder.add_assistant(f"😊 Fatto.")
+        msg_builder.add_tool_exchange(tool_call, response_json, "ui_control", "😊 Fatto.")
         
         return {
             "tools": "{{TOOL_DEFINITION}}",
@@ -2,6 +2,7 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from core.jsonl import encode_record
 
 # Reuse hydrate_dataset logic for template replacement
 def hydrate_content(template: str, params: dict) -> str:
@@ -64,7 +65,7 @@ def process_file(input_file: Path, output_file: Path, template_content: str, too
                     contexts = [{"slice_length": len(messages), "params": base_params}]
                 else:
                     # No params? Write as is (with tools hydrated if present)
-                    fout.write(json.dumps(data, ensure_ascii=False) + "\n")
+                    fout.write(encode_record(data) + "\n")
                     count_out += 1
                     continue
             
@@ -97,7 +98,7 @@ def process_file(input_file: Path, output_file: Path, template_content: str, too
                     }
                 }
                 
-                fout.write(json.dumps(new_sample, ensure_ascii=False) + "\n")
+                fout.write(encode_record(new_sample) + "\n")
                 count_out += 1
                 
     print(f"  Read {count_in} samples, Wrote {count_out} slices.")
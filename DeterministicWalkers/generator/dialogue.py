@@ -1,10 +1,57 @@
+import itertools
+import logging
 import random
 import json
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
+from json.encoder import encode_basestring_ascii as _json_str
 from generator.deterministic import DeterministicGenerator
 from generator.mock_api import MockBackend
 
+logger = logging.getLogger(__name__)
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+@lru_cache(maxsize=None)
+def _load_resource(filename):
+    """Parse a JSON file from resources/ once per process. Callers must not mutate the result."""
+    with open(os.path.join(RESOURCES_DIR, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# "HH:MM" strings indexed as _TIME_STRINGS[hour][minute].
+_TIME_STRINGS = tuple(tuple(f"{h:02d}:{m:02d}" for m in range(60)) for h in range(24))
+
+# Sequential tool call ids ("call_001", ...); dialogues stay well below this.
+_CALL_IDS = tuple(f"call_{i:03d}" for i in range(64))
+
+@lru_cache(maxsize=1)
+def _ctx_dates(today):
+    """"YYYY-MM-DD" for today + 0..60 days, rebuilt only when the date changes."""
+    return tuple((today + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(61))
+
+# Serialized ui_state strings keyed by (state, can flags). Only a handful of
+# combinations ever occur, so each one is dumped once instead of per snapshot.
+_UI_STATE_JSON = {}
+
+def _ui_state_json(ui_state):
+    can = ui_state.get("can")
+    if len(ui_state) != 2 or not isinstance(can, dict):
+        return json.dumps(ui_state)
+    key = (ui_state.get("state"), tuple(can.items()))
+    cached = _UI_STATE_JSON.get(key)
+    if cached is None:
+        cached = _UI_STATE_JSON[key] = json.dumps(ui_state)
+    return cached
+
+def _tool_call(call_id, name, arguments):
+    """Assistant tool call entry; arguments is the already-serialized JSON string."""
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+def _search_arguments(origin, destination, time):
+    """json.dumps({"origin", "destination", "time"}) for this fixed shape, without the dict."""
+    return f'{{"origin": {_json_str(origin)}, "destination": {_json_str(destination)}, "time": {_json_str(time)}}}'
+
 class DialogueGenerator:
     def __init__(self, corpus=None, enhancer=None, distribution=None):
         # We don't strictly need corpus anymore, but we keep the signature compatible for now.
@@ -15,70 +62,89 @@ class DialogueGenerator:
         self.distribution = distribution or {}
         
         # Load stations
-        stations_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'stations.json')
         try:
-            with open(stations_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.major_stations = data.get("major", [])
-                # Flatten all stations for destinations
-                all_stations = []
-                for key in data:
-                    if isinstance(data[key], list):
-                        all_stations.extend(data[key])
-                self.origins = self.major_stations
-                self.destinations = list(set(all_stations)) # unique
+            data = _load_resource('stations.json')
+            # Tuples: the parsed JSON is shared (lru_cache) and these are only read
+            self.major_stations = tuple(data.get("major", ()))
+            # Flatten all stations for destinations
+            all_stations = itertools.chain.from_iterable(
+                v for v in data.values() if isinstance(v, list)
+            )
+            self.origins = self.major_stations
+            self.destinations = tuple(set(all_stations)) # unique
         except Exception as e:
             print(f"Warning: Could not load stations.json ({e}), using defaults.")
-            self.origins = ["Milano Centrale", "Roma Termini", "Napoli Centrale"]
-            self.destinations = ["Roma", "Milano", "Napoli", "Firenze"]
+            self.origins = ("Milano Centrale", "Roma Termini", "Napoli Centrale")
+            self.destinations = ("Roma", "Milano", "Napoli", "Firenze")
+
+        # Origin city prefix -> destinations in other cities (see _destinations_for)
+        self._destinations_by_prefix = {}
 
         self.dates = ["oggi", "domani", "venerdì", "il 25 aprile"]
         self.times = ["mattina", "pomeriggio", "sera", "10:00", "15:30", "subito"]
         
         self.refusal_reasons = ["too_expensive", "too_late", "wrong_type"]
 
+        # Scenario step name -> bound handler, resolved once instead of per step
+        self._step_handlers = {
+            "greeting": self._step_greeting,
+            "search": self._step_search,
+            "qa": self._step_qa,
+            "ui": self._step_ui,
+            "ood": self._step_ood_turn,
+            "complaint": self._step_complaint,
+            "selection_purchase": self._step_selection_purchase,
+            "farewell": self._step_farewell,
+        }
+
         # Load QA Pairs
-        qa_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'qa_pairs.json')
         self.qa_pairs = []
         try:
-            if os.path.exists(qa_path):
-                with open(qa_path, 'r', encoding='utf-8') as f:
-                    self.qa_pairs = json.load(f)
+            if os.path.exists(os.path.join(RESOURCES_DIR, 'qa_pairs.json')):
+                self.qa_pairs = _load_resource('qa_pairs.json')
         except Exception as e:
             print(f"Warning: Could not load qa_pairs.json ({e}).")
 
         # Load OOD Questions (Refusals)
-        starters_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'refusal_starters.json')
-        followups_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'refusal_followups.json')
         self.ood_starters = []
         self.ood_followups = []
         try:
-            if os.path.exists(starters_path):
-                with open(starters_path, 'r', encoding='utf-8') as f:
-                    self.ood_starters = json.load(f)
-            if os.path.exists(followups_path):
-                with open(followups_path, 'r', encoding='utf-8') as f:
-                    self.ood_followups = json.load(f)
+            if os.path.exists(os.path.join(RESOURCES_DIR, 'refusal_starters.json')):
+                self.ood_starters = _load_resource('refusal_starters.json')
+            if os.path.exists(os.path.join(RESOURCES_DIR, 'refusal_followups.json')):
+                self.ood_followups = _load_resource('refusal_followups.json')
         except Exception as e:
             print(f"Warning: Could not load refusal files ({e}). OOD will be disabled.")
 
     def generate_dialogues(self, count=100):
-        dialogues = []
+        return list(self.iter_dialogues(count))
+
+    def iter_dialogues(self, count=100):
+        """Yield dialogues one at a time, so callers can write them out without holding the set."""
         print(f"[Dialogue] Generating {count} dynamic dialogues...")
         
         for i in range(count):
             self.backend = MockBackend(seed=i) # Reset backend per dialogue
             try:
                 d = self._build_dynamic_flow(i)
-                dialogues.append(d)
             except Exception as e:
                 print(f"Error generating dialogue {i}: {e}")
-                
-        return dialogues
+                continue
+            yield d
+
+    def _destinations_for(self, origin):
+        """Destinations outside the origin's city, filtered once per city prefix."""
+        prefix = origin[:3]
+        candidates = self._destinations_by_prefix.get(prefix)
+        if candidates is None:
+            candidates = tuple(d for d in self.destinations if d[:3] != prefix)
+            self._destinations_by_prefix[prefix] = candidates
+        return candidates
+
     def _init_context(self, run_id):
         """Randomly initializes the global context variables for this dialogue."""
         origin = random.choice(self.origins)
-        dest = random.choice([d for d in self.destinations if d[:3] != origin[:3]]) # Avoid same city
+        dest = random.choice(self._destinations_for(origin)) # Avoid same city
         
         # Rudeness selection
         rudeness_dist = self.distribution.get("rudeness_distribution", {})
@@ -104,8 +170,8 @@ class DialogueGenerator:
             "generated_messages": [{"role": "system", "content": "{SYSTEM_PROMPT}"}],
             "current_trains": [], # Result from mock backend
             "ui_state": {"state": "idle", "can": {"next": False, "prev": False, "back": False}},
-            "ctx_time": f"{random.randint(6, 22):02d}:{random.randint(0, 59):02d}", 
-            "ctx_date": (datetime.now() + timedelta(days=random.randint(0, 60))).strftime("%Y-%m-%d"),
+            "ctx_time": _TIME_STRINGS[random.randint(6, 22)][random.randint(0, 59)], 
+            "ctx_date": _ctx_dates(datetime.now().date())[random.randint(0, 60)],
             "call_counter": 0
         }
 
@@ -113,6 +179,8 @@ class DialogueGenerator:
         if "call_counter" not in context:
             context["call_counter"] = 0
         context["call_counter"] += 1
+        if context["call_counter"] < len(_CALL_IDS):
+            return _CALL_IDS[context["call_counter"]]
         return f"call_{context['call_counter']:03d}"
 
     def _render_utterance_data(self, intent, context, **overrides):
@@ -205,7 +273,7 @@ class DialogueGenerator:
             "slice_length": slice_len,
             "params": {
                 "origin": context["origin"],
-                "ui_state": json.dumps(context["ui_state"]) if isinstance(context["ui_state"], dict) else str(context["ui_state"]), 
+                "ui_state": _ui_state_json(context["ui_state"]) if isinstance(context["ui_state"], dict) else str(context["ui_state"]), 
                 "trains_array": json.dumps(context["current_trains"]),
                 "ctx_time": context["ctx_time"],
                 "date": context["ctx_date"],
@@ -273,14 +341,9 @@ class DialogueGenerator:
         if not tool_time or tool_time in ["mattina", "pomeriggio", "sera", "subito", "ora", "adesso"]:
              tool_time = ctx["ctx_time"]
 
-        tool_call = {
-            "id": call_id,
-            "type": "function",
-            "function": {
-                "name": "search_trains",
-                "arguments": json.dumps({"origin": ctx["origin"], "destination": ctx["destination"], "time": tool_time})
-            }
-        }
+        tool_call = _tool_call(
+            call_id, "search_trains", _search_arguments(ctx["origin"], ctx["destination"], tool_time)
+        )
         
         # Mock Backend Response
         resp_json = self.backend.search_trains(tool_call["function"]["arguments"])
@@ -366,14 +429,7 @@ class DialogueGenerator:
             else:
                 args["train_position"] = random.randint(1, min(3, len(ctx.get("current_trains", [])) or 1))
             
-        tool_call = {
-            "id": call_id,
-            "type": "function",
-            "function": {
-                "name": "ui_control",
-                "arguments": json.dumps(args)
-            }
-        }
+        tool_call = _tool_call(call_id, "ui_control", json.dumps(args))
         
         resp_json = self.backend.ui_control(tool_call["function"]["arguments"])
         resp_data = json.loads(resp_json)
@@ -423,6 +479,11 @@ class DialogueGenerator:
                 self._add_turn(ctx, "assistant", resp)
                 meta_contexts.append(self._snapshot_meta(ctx, len(ctx["generated_messages"])))
 
+    def _step_ood_turn(self, ctx, meta_contexts):
+        # If first turn, it's a starter
+        is_starter = len(ctx["generated_messages"]) <= 1
+        self._step_ood(ctx, meta_contexts, starter=is_starter)
+
     def _step_selection_purchase(self, ctx, meta_contexts):
         if not ctx.get("current_trains"):
             return
@@ -496,14 +557,7 @@ class DialogueGenerator:
             purchase_args["seat"] = ctx.get("chosen_seat", "4A")
             purchase_args["carriage"] = random.randint(1, 8)
             
-        tool_call = {
-            "id": call_id,
-            "type": "function",
-            "function": {
-                "name": "purchase_ticket",
-                "arguments": json.dumps(purchase_args)
-            }
-        }
+        tool_call = _tool_call(call_id, "purchase_ticket", json.dumps(purchase_args))
         resp_json = self.backend.purchase_ticket(tool_call["function"]["arguments"])
         resp_data = json.loads(resp_json)
         self._add_turn(ctx, "assistant", None, tool_calls=[tool_call], tool_output=resp_json)
@@ -566,7 +620,8 @@ class DialogueGenerator:
                 with open(scenario_path, 'r', encoding='utf-8') as f:
                     scenario_steps = [line.strip() for line in f if line.strip() and not line.startswith("#")]
 
-        print(f"[Dialogue] Run {run_id} using scenario: '{scenario_name}'")
+        # Per-dialogue trace: debug level, so bulk runs don't write a line per sample
+        logger.debug("[Dialogue] Run %s using scenario: '%s'", run_id, scenario_name)
         
         ctx = self._init_context(run_id)
         meta_contexts = []
@@ -591,25 +646,10 @@ class DialogueGenerator:
                 if param:
                     ctx["topic"] = param
 
-                if step == "greeting":
-                    self._step_greeting(ctx, meta_contexts)
-                elif step == "search":
-                    if not self._step_search(ctx, meta_contexts):
-                        break # Stop if no trains
-                elif step == "qa":
-                    self._step_qa(ctx, meta_contexts)
-                elif step == "ui":
-                    self._step_ui(ctx, meta_contexts)
-                elif step == "ood":
-                    # If first turn, it's a starter
-                    is_starter = len(ctx["generated_messages"]) <= 1
-                    self._step_ood(ctx, meta_contexts, starter=is_starter)
-                elif step == "complaint":
-                    self._step_complaint(ctx, meta_contexts)
-                elif step == "selection_purchase":
-                    self._step_selection_purchase(ctx, meta_contexts)
-                elif step == "farewell":
-                    self._step_farewell(ctx, meta_contexts)
+                handler = self._step_handlers.get(step)
+                # Handlers return False to stop the flow (e.g. search with no trains)
+                if handler is not None and handler(ctx, meta_contexts) is False:
+                    break
         
         result = self._finalize(ctx, meta_contexts)
         result["_meta"]["scenario_name"] = scenario_name # Add to metadata
@@ -1,7 +1,15 @@
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
+from generator.jsonl import encode_record
+
+@lru_cache(maxsize=256)
+def _parse_ui_state(ui_state: str) -> Dict[str, Any]:
+    """Parsed ui_state JSON. Only a handful of distinct states occur, so each is
+    decoded once; the result is shared and only read by the template."""
+    return json.loads(ui_state)
 
 class DataSetHydrator:
     """
@@ -9,12 +17,27 @@ class DataSetHydrator:
     Decoupled from specific prompt formats; uses placeholder replacement.
     """
     
+    # Output is written line by line; a 1 MiB buffer batches those writes
+    WRITE_BUFFER_SIZE = 1 << 20
+    
+    # Fallback values for context params missing from a record
+    DEFAULT_PARAMS = {
+        "origin": "UNKNOWN",
+        "ctx_time": "12:00",
+        "date": "2024-05-01",
+        "ui_state": '{"state":"idle"}',
+        "trains_array": "[]",
+        "ticket_info": None
+    }
+    
     def __init__(self, template_path: Path, tools_path: Optional[Path] = None, remove_meta: bool = False):
         self.template_path = template_path
         self.tools_path = tools_path
         self.remove_meta = remove_meta
         self.template_content = self._load_template()
         self.tools_content = self._load_tools()
+        # Compiled Jinja2 template, built on first use (see _get_template)
+        self._template = None
 
     def _load_template(self) -> str:
         if not self.template_path.exists():
@@ -33,6 +56,13 @@ class DataSetHydrator:
             print(f"Warning: Invalid JSON in tools definition file: {self.tools_path}")
             return None
 
+    def _get_template(self):
+        """Compile the system prompt template once; it is the same for every record."""
+        if self._template is None:
+            from jinja2 import Template
+            self._template = Template(self.template_content)
+        return self._template
+
     def hydrate_line(self, line_content: str) -> str:
         """Hydrate a single JSONL line (1:1 mapping)."""
         try:
@@ -63,24 +93,14 @@ class DataSetHydrator:
                 prepared_params = self._prepare_params(params)
                 
                 try:
-                    from jinja2 import Template
-                    template = Template(self.template_content)
-                    
-                    defaults = {
-                         "origin": "UNKNOWN",
-                         "ctx_time": "12:00",
-                         "date": "2024-05-01",
-                         "ui_state": '{"state":"idle"}',
-                         "trains_array": "[]",
-                         "ticket_info": None
-                    }
+                    template = self._get_template()
                     
-                    hydration_context = defaults.copy()
+                    hydration_context = self.DEFAULT_PARAMS.copy()
                     hydration_context.update(prepared_params)
                     
                     # Ensure ui_state_raw is there
                     if "ui_state_raw" not in hydration_context:
-                        hydration_context["ui_state_raw"] = json.loads(hydration_context["ui_state"])
+                        hydration_context["ui_state_raw"] = _parse_ui_state(hydration_context["ui_state"])
                     
                     hydrated_content = template.render(**hydration_context)
                     system_message["content"] = hydrated_content
@@ -92,7 +112,7 @@ class DataSetHydrator:
         if self.remove_meta:
             data.pop("_meta", None)
 
-        return json.dumps(data, ensure_ascii=False)
+        return encode_record(data)
 
     def _prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare raw parameters for Jinja2."""
@@ -101,7 +121,7 @@ class DataSetHydrator:
         # ui_state -> ui_state_raw
         if "ui_state" in p and isinstance(p["ui_state"], str):
             try:
-                p["ui_state_raw"] = json.loads(p["ui_state"])
+                p["ui_state_raw"] = _parse_ui_state(p["ui_state"])
             except:
                 p["ui_state_raw"] = {"state": "unknown"}
         elif "ui_state" in p and isinstance(p["ui_state"], dict):
@@ -123,7 +143,7 @@ class DataSetHydrator:
         """Process a single file."""
         count = 0
         with open(input_path, 'r', encoding='utf-8') as fin, \
-             open(output_path, 'w', encoding='utf-8') as fout:
+             open(output_path, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as fout:
             for line in fin:
                 line = line.strip()
                 if not line: continue
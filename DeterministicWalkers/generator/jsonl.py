@@ -0,0 +1,6 @@
+import json
+
+# Single JSONL record encoder for the raw dialogue writer (main.py) and the
+# hydrator, so their output format cannot drift apart. Built once: json.dumps
+# creates a new JSONEncoder on every call when ensure_ascii=False is passed.
+encode_record = json.JSONEncoder(ensure_ascii=False).encode
@@ -5,6 +5,7 @@ import shutil
 from generator.llm_enhancer import LLMEnhancer
 from generator.dialogue import DialogueGenerator
 from generator.hydrator import DataSetHydrator
+from generator.jsonl import encode_record
 from pathlib import Path
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
@@ -57,12 +58,15 @@ def main():
                 print(f"Warning: Could not load distribution_config.json: {e}")
 
         dial_gen = DialogueGenerator(enhancer=enhancer, distribution=dist_config)
-        dialogues = dial_gen.generate_dialogues(count=args.dialogues)
         
-        print(f"Saving {len(dialogues)} raw dialogues to {DIALOGUE_FILE}...")
+        print(f"Saving raw dialogues to {DIALOGUE_FILE}...")
+        # Streamed: each dialogue is written as soon as it is built
+        saved = 0
         with open(DIALOGUE_FILE, 'w', encoding='utf-8') as f:
-            for item in dialogues:
-                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+            for item in dial_gen.iter_dialogues(count=args.dialogues):
+                f.write(encode_record(item) + '\n')
+                saved += 1
+        print(f"Saved {saved} raw dialogues.")
 
         # 5. Hydration
     print("Hydrating dataset...")
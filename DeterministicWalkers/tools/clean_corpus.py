@@ -12,9 +12,10 @@ def load_json_list(filepath):
         return []
 
 def save_json_list(filepath, data):
+    items = sorted(set(data))
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(sorted(list(set(data))), f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(data)} items to {filepath.name}")
+        f.write(json.dumps(items, indent=2, ensure_ascii=False))
+    print(f"Saved {len(items)} items to {filepath.name}")
 
 def clean_corpus():
     base_dir = Path(__file__).parent.parent / "resources" / "corpus"
@@ -37,8 +38,8 @@ def clean_corpus():
     print(f"Initial counts: Confirmations={len(confirmations)}, Farewells={len(farewells)}, ChitChat={len(chitchat)}")
 
     # Pool everything to re-sort
-    pool = confirmations + farewells + chitchat
-    pool = list(set(pool)) # Unique
+    # Unique, in file order (dict.fromkeys keeps first occurrences), so runs are reproducible
+    pool = list(dict.fromkeys(confirmations + farewells + chitchat))
     
     new_confirmations = []
     new_farewells = []
@@ -48,50 +49,43 @@ def clean_corpus():
     # Keywords
     farewell_keywords = ["arrivederci", "a presto", "ciao", "buona serata", "buona giornata", "addio", "alla prossima", "buonanotte"]
     confirmation_keywords = ["ok", "va bene", "perfetto", "ottimo", "sì", "si ", "benissimo", "bene", "d'accordo", "capito", "chiaro", "grazie"]
+    # One scan per text: substring alternation for farewells, tuple prefixes for startswith
+    farewell_re = re.compile("|".join(map(re.escape, farewell_keywords)))
+    confirmation_prefixes = tuple(confirmation_keywords)
     
-    # Heuristics
+    # Heuristics (cheapest decisive check first; words are only counted when needed)
     for text in pool:
         lower = text.lower().strip()
-        words = lower.split()
-        num_words = len(words)
-        
-        is_farewell = False
-        is_confirmation = False
         
         # Check Farewell
-        if any(k in lower for k in farewell_keywords):
+        if farewell_re.search(lower):
             # Special case: "Grazie" alone is confirmation, but "Grazie e buona serata" is farewell
-            is_farewell = True
-            
-        # Check Confirmation
-        if not is_farewell:
-            # Starts with confirmation keyword?
-            if any(lower.startswith(k) for k in confirmation_keywords):
-                is_confirmation = True
-            
-            # Short "Grazie" or "Grazie mille" is confirmation
-            if "grazie" in lower and num_words <= 5:
-                is_confirmation = True
-                
-        # Classify
-        if is_farewell:
             new_farewells.append(text)
-        elif is_confirmation:
+            continue
+        
+        # Check Confirmation: starts with confirmation keyword?
+        if lower.startswith(confirmation_prefixes):
             # If it's very long, it might be chitchat beginning with confirmation
             # "Sì, ma oggi piove tanto e sono triste..." -> ChitChat
-            if num_words > 10:
+            if len(lower.split()) > 10:
                 new_chitchat.append(text)
             else:
                 new_confirmations.append(text)
+            continue
+        
+        # Short "Grazie" or "Grazie mille" is confirmation
+        if "grazie" in lower and len(lower.split()) <= 5:
+            new_confirmations.append(text)
+            continue
+        
+        # Neither?
+        # e.g. "Piove molto oggi" -> ChitChat
+        # e.g. "Voglio un biglietto" -> Purchase (shouldn't be here ideally)
+        if "biglietto" in lower or "prenotare" in lower or "acquisto" in lower:
+             # It's a purchase intent leaked here?
+             pass 
         else:
-            # Neither?
-            # e.g. "Piove molto oggi" -> ChitChat
-            # e.g. "Voglio un biglietto" -> Purchase (shouldn't be here ideally)
-            if "biglietto" in lower or "prenotare" in lower or "acquisto" in lower:
-                 # It's a purchase intent leaked here?
-                 pass 
-            else:
-                 new_chitchat.append(text)
+             new_chitchat.append(text)
 
     # Save Back
     save_json_list(confirmations_path, new_confirmations)
@@ -24,16 +24,63 @@ TIME_PATTERNS = [
     (re.compile(r'\boggi\b', re.IGNORECASE), "{relative_today}"),
 ]
 
+# TIME_PATTERNS fused into one scan: each pattern becomes a named group, tried in list
+# order at every position, and the group that matched picks the replacement.
+# Every pattern opens with \b, which is checked once up front instead of per branch.
+TIME_COMBINED = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<t{i}>{pat.pattern[2:]})' for i, (pat, _) in enumerate(TIME_PATTERNS)) + ')',
+    re.IGNORECASE
+)
+TIME_REPLACEMENTS = {f't{i}': repl for i, (_, repl) in enumerate(TIME_PATTERNS)}
+
+def _time_replacement(match: re.Match) -> str:
+    return TIME_REPLACEMENTS[match.lastgroup]
+
 # Farewells - Strict
 FAREWELL_KEYWORDS = {"arrivederci", "a presto", "ciao", "buona serata", "buona giornata", "addio", "alla prossima"}
 FAREWELL_MAX_WORDS = 4
 
+# Input JSONL files are read through a 1 MiB buffer instead of the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+
+def _trie_alternation(words: List[str]) -> str:
+    """
+    Regex alternation of words (matched case-insensitively) with shared prefixes factored out.
+    
+    "Roma|Rovereto|Rovigo" becomes "ro(?:ma|v(?:ereto|igo))", so the engine follows one
+    branch per character instead of retrying every word at each position. Longer
+    continuations are tried before a word ends, so the longest word still wins.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for ch in word.lower():
+            node = node.setdefault(ch, {})
+        node[''] = {} # end of word
+    
+    def build(node: Dict[str, Dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if '' in node:
+            alts.append('')
+        if len(alts) == 1:
+            return alts[0]
+        return '(?:' + '|'.join(alts) + ')'
+    
+    return build(trie)
+
 class CorpusBuilder:
     def __init__(self, output_path: Path, stations_path: Path):
         self.output_path = output_path
         self.stations_path = stations_path
-        self.corpus = collections.defaultdict(list)
+        # Category -> unique texts; duplicates are dropped as they are found, not held until save()
+        self.corpus = collections.defaultdict(set)
         self.known_cities = self._load_cities()
+        # All cities as one word-bounded, prefix-factored alternation (longest match wins,
+        # so "Reggio Emilia" beats "Reggio")
+        self.cities_pat = (
+            re.compile(r'\b' + _trie_alternation(self.known_cities) + r'\b', re.IGNORECASE)
+            if self.known_cities else None
+        )
         self.stats = collections.defaultdict(int)
 
     def _load_cities(self) -> List[str]:
@@ -70,20 +117,13 @@ class CorpusBuilder:
                 text = text.replace(real_origin, "{origin}")
         
         # 2. Known Cities
-        for city in self.known_cities:
-            pat = re.compile(rf'\b{re.escape(city)}\b', re.IGNORECASE)
-            if pat.search(text):
-                text = pat.sub("{destination}", text) # Default to destination if ambiguous
+        if self.cities_pat is not None:
+            text = self.cities_pat.sub("{destination}", text) # Default to destination if ambiguous
                 
         # 3. Time Patterns
-        if REGEX_EXACT_TIME.search(text):
-            text = REGEX_EXACT_TIME.sub("{time_request}", text)
-        
+        text = REGEX_EXACT_TIME.sub("{time_request}", text)
         text = REGEX_HOUR_ONLY.sub("alle {time_request}", text)
-        
-        for pat, repl in TIME_PATTERNS:
-            if pat.search(text):
-                text = pat.sub(repl, text)
+        text = TIME_COMBINED.sub(_time_replacement, text)
 
         # 4. Train Info
         text = TRAIN_NAME_PAT.sub("{train_info}", text)
@@ -105,10 +145,15 @@ class CorpusBuilder:
 
     def process_file(self, file_path: Path):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Bound once for the per-line loop; blank lines are skipped before parsing
+            # instead of raising (and catching) a JSONDecodeError each
+            loads = json.loads
+            with open(file_path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as f:
                 for line in f:
+                    if line.isspace():
+                        continue
                     try:
-                        data = json.loads(line)
+                        data = loads(line)
                         if isinstance(data, list):
                             # It might be a list of conversations or a list of messages representing one conversation
                             # Heuristic: if first item has 'role', assume it's one conversation
@@ -124,6 +169,30 @@ class CorpusBuilder:
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
 
+    def process_files(self, files: List[Path], workers: int = 1):
+        """
+        Process input files, optionally across worker processes.
+        
+        Each worker extracts into its own corpus/stats; the parts are merged back
+        in file order, so the saved corpus and the stats match a sequential run.
+        """
+        if workers > 1 and len(files) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(files)),
+                initializer=_init_worker,
+                initargs=(self.output_path, self.stations_path)
+            ) as pool:
+                for corpus, stats in pool.map(_process_file_in_worker, files):
+                    for key, items in corpus.items():
+                        self.corpus[key].update(items)
+                    for key, count in stats.items():
+                        self.stats[key] += count
+            return
+        
+        for f in files:
+            self.process_file(f)
+
     def _extract_conversation(self, data: Dict):
         # Normalize structure
         conversations = data.get("conversations", [data])
@@ -167,21 +236,21 @@ class CorpusBuilder:
                         pass 
                     
                     if not has_searched:
-                        self.corpus["search_queries"].append(normalized)
+                        self.corpus["search_queries"].add(normalized)
                         self.stats["search_queries"] += 1
                         has_searched = True
                     else:
-                        self.corpus["refinements"].append(normalized)
+                        self.corpus["refinements"].add(normalized)
                         self.stats["refinements"] += 1
                         
                 # 2. Purchase
                 elif tool_name == "purchase_ticket":
-                    self.corpus["purchase_intents"].append(normalized)
+                    self.corpus["purchase_intents"].add(normalized)
                     self.stats["purchase_intents"] += 1
                     
                 # 3. Navigation
                 elif tool_name == "ui_control":
-                    self.corpus["navigation"].append(normalized)
+                    self.corpus["navigation"].add(normalized)
                     self.stats["navigation"] += 1
                     
                 # 4. Refusals & Rude (often from negative samples directories)
@@ -192,44 +261,65 @@ class CorpusBuilder:
                     
                     # Farewells - Strict
                     if self.is_valid_farewell(content):
-                        self.corpus["farewells"].append(content) # Keep original case?
+                        self.corpus["farewells"].add(content) # Keep original case?
                         self.stats["farewells"] += 1
                         
                     # Greetings
                     # Relaxed check: keywords and short length
                     elif any(x in lower for x in ["ciao", "salve", "buongiorno", "buonasera"]) and num_words <= 3:
-                         self.corpus["greetings"].append(content)
+                         self.corpus["greetings"].add(content)
                          self.stats["greetings"] += 1
 
                     # Confirmations
                     elif any(x in lower for x in ["sì", "si", "ok", "va bene", "perfetto"]) and num_words <= 4:
                          if "?" not in content:
-                             self.corpus["confirmations"].append(normalized)
+                             self.corpus["confirmations"].add(normalized)
                              self.stats["confirmations"] += 1
 
     def save(self):
         self.output_path.mkdir(parents=True, exist_ok=True)
         for key, items in self.corpus.items():
-            # Deduplicate and Sort
-            unique_items = sorted(list(set(items)))
-            
-            # Sanity Check: Remove empty items
-            unique_items = [x for x in unique_items if x.strip()]
+            # Already unique: Sort, dropping empty items (sanity check)
+            unique_items = sorted(x for x in items if x.strip())
             
             if not unique_items: continue
             
+            # Serialize first, then write a sibling temp file and swap it in: an
+            # interrupted run never leaves a truncated category file behind, and a
+            # failed write removes its temp file instead of leaving it in the corpus
             out_file = self.output_path / f"{key}.json"
-            with open(out_file, 'w', encoding='utf-8') as f:
-                json.dump(unique_items, f, indent=2, ensure_ascii=False)
+            tmp_file = out_file.with_name(out_file.name + ".tmp")
+            try:
+                tmp_file.write_text(json.dumps(unique_items, indent=2, ensure_ascii=False), encoding='utf-8')
+                tmp_file.replace(out_file)
+            except BaseException:
+                tmp_file.unlink(missing_ok=True)
+                raise
                 
         print("Corpus Extraction Complete.")
         print(json.dumps(self.stats, indent=2))
 
+# Per-process builder for process_files workers (cities are loaded once per worker)
+_worker_builder = None
+
+def _init_worker(output_path: Path, stations_path: Path):
+    global _worker_builder
+    _worker_builder = CorpusBuilder(output_path, stations_path)
+
+def _process_file_in_worker(file_path: Path) -> Tuple[Dict[str, Set[str]], Dict[str, int]]:
+    """Extract one file into a fresh corpus/stats and hand both back to the parent."""
+    builder = _worker_builder
+    builder.corpus = collections.defaultdict(set)
+    builder.stats = collections.defaultdict(int)
+    builder.process_file(file_path)
+    return dict(builder.corpus), dict(builder.stats)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--inputs", "-i", type=str, nargs='+', required=True, help="Input directories or files")
     parser.add_argument("--output", "-o", type=str, required=True, help="Output directory")
     parser.add_argument("--stations", "-s", type=str, required=True, help="Path to stations.json")
+    parser.add_argument("--workers", "-j", type=int, default=1, help="Process input files in parallel across N processes")
     
     args = parser.parse_args()
     
@@ -244,7 +334,6 @@ if __name__ == "__main__":
             files.extend(path.rglob("*.jsonl"))
             
     print(f"Processing {len(files)} files...")
-    for f in files:
-        builder.process_file(f)
+    builder.process_files(files, workers=args.workers)
         
     builder.save()
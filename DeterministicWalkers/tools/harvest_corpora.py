@@ -2,10 +2,54 @@ import json
 import os
 import hashlib
 import argparse
+from pathlib import Path
+
+# Input JSONL files are read through a 1 MiB buffer instead of the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
 
 def get_file_hash(content):
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
+def _user_contents(messages):
+    return [m['content'] for m in messages if m.get('role') == 'user' and m.get('content')]
+
+# Harvest strategies for dict records, keyed by the field that identifies the format and
+# tried in this order. A handler returns None when the field is there but unusable
+# (e.g. 'messages' is not a list), so the next strategy gets a chance.
+def _from_domanda(data):
+    # STRATEGY 1: 'domanda' field (QA pairs)
+    return [data['domanda']]
+
+def _from_text(data):
+    # STRATEGY 2: 'text' field (Simple commands)
+    return [data['text']]
+
+def _from_messages(data):
+    # STRATEGY 3: 'messages' list (OpenAI/Dataset format)
+    return _user_contents(data['messages']) if isinstance(data['messages'], list) else None
+
+def _from_turns(data):
+    # STRATEGY 4: 'turns' list (FS Conversations)
+    return _user_contents(data['turns']) if isinstance(data['turns'], list) else None
+
+def _from_conversations(data):
+    # STRATEGY 5: 'conversations' wrapper (Some FS formats)
+    if not isinstance(data['conversations'], list):
+        return None
+    utterances = []
+    for sub_conv in data['conversations']:
+        # Check for turns or messages inside
+        utterances.extend(_user_contents(sub_conv.get('turns') or sub_conv.get('messages') or []))
+    return utterances
+
+HANDLERS = {
+    'domanda': _from_domanda,
+    'text': _from_text,
+    'messages': _from_messages,
+    'turns': _from_turns,
+    'conversations': _from_conversations,
+}
+
 def extract_utterances_from_manifest(manifest_path, output_file):
     with open(manifest_path, 'r', encoding='utf-8') as f:
         file_list = json.load(f)
@@ -15,62 +59,52 @@ def extract_utterances_from_manifest(manifest_path, output_file):
 
     print(f"Loaded manifest with {len(file_list)} files.")
 
-    for file_path in file_list:
-        if not os.path.exists(file_path):
+    # Relative manifest entries are resolved against the current directory, as
+    # before; when no such file exists, the manifest's own folder is tried next,
+    # so a manifest can also travel with its datasets
+    manifest_dir = Path(manifest_path).resolve().parent
+
+    for entry in file_list:
+        file_path = Path(entry)
+        if not file_path.is_absolute() and not file_path.is_file():
+            file_path = manifest_dir / file_path
+        if not file_path.is_file():
             print(f"Warning: File not found: {file_path}")
             continue
 
-        print(f"Processing {os.path.basename(file_path)}...")
+        source = file_path.name
+        print(f"Processing {source}...")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            loads = json.loads # bound once for the per-line loop
+            with open(file_path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as f:
                 for line_num, line in enumerate(f):
                     line = line.strip()
                     if not line:
                         continue
                     
                     try:
-                        data = json.loads(line)
+                        data = loads(line)
                     except json.JSONDecodeError:
                         print(f"  Skipping invalid JSON at line {line_num+1}")
                         continue
 
                     utterances_to_add = []
 
-                    # STRATEGY 1: 'domanda' field (QA pairs)
-                    if isinstance(data, dict) and 'domanda' in data:
-                        utterances_to_add.append(data['domanda'])
-
-                    # STRATEGY 2: 'text' field (Simple commands)
-                    elif isinstance(data, dict) and 'text' in data:
-                        utterances_to_add.append(data['text'])
-
-                    # STRATEGY 3: 'messages' list (OpenAI/Dataset format)
-                    elif isinstance(data, dict) and 'messages' in data and isinstance(data['messages'], list):
-                        for msg in data['messages']:
-                            if msg.get('role') == 'user' and msg.get('content'):
-                                utterances_to_add.append(msg['content'])
-
-                    # STRATEGY 4: 'turns' list (FS Conversations)
-                    elif isinstance(data, dict) and 'turns' in data and isinstance(data['turns'], list):
-                        for turn in data['turns']:
-                            if turn.get('role') == 'user' and turn.get('content'):
-                                utterances_to_add.append(turn['content'])
-
-                    # STRATEGY 5: 'conversations' wrapper (Some FS formats)
-                    elif isinstance(data, dict) and 'conversations' in data and isinstance(data['conversations'], list):
-                        for sub_conv in data['conversations']:
-                             # Check for turns or messages inside
-                             turns = sub_conv.get('turns') or sub_conv.get('messages') or []
-                             for turn in turns:
-                                if turn.get('role') == 'user' and turn.get('content'):
-                                    utterances_to_add.append(turn['content'])
+                    if isinstance(data, dict):
+                        for key, handler in HANDLERS.items():
+                            if key in data:
+                                found = handler(data)
+                                if found is not None:
+                                    utterances_to_add = found
+                                    break
 
                     # STRATEGY 6: Root list of messages (Synth Func)
                     elif isinstance(data, list):
-                        for item in data:
-                            if isinstance(item, dict) and item.get('role') == 'user' and item.get('content'):
-                                utterances_to_add.append(item['content'])
+                        utterances_to_add = [
+                            item['content'] for item in data
+                            if isinstance(item, dict) and item.get('role') == 'user' and item.get('content')
+                        ]
 
                     # Add extracted
                     for text in utterances_to_add:
@@ -80,7 +114,7 @@ def extract_utterances_from_manifest(manifest_path, output_file):
                             harvested.append({
                                 "id": f"utt_{get_file_hash(text)[:10]}",
                                 "text": text,
-                                "source": os.path.basename(file_path),
+                                "source": source,
                                 "primary_category": "UNCATEGORIZED" 
                             })
 
@@ -91,7 +125,7 @@ def extract_utterances_from_manifest(manifest_path, output_file):
     
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(harvested, f, indent=2, ensure_ascii=False)
+        f.write(json.dumps(harvested, indent=2, ensure_ascii=False))
     
     print(f"Saved to {output_file}")
 
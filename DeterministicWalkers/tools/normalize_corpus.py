@@ -42,6 +42,11 @@ def normalize_corpus():
     cities = load_cities()
     print(f"Loaded {len(cities)} unique city names for normalization.")
 
+    # City patterns compiled once, word-bounded, longest city first (as load_cities sorts)
+    city_patterns = [re.compile(rf'\b{re.escape(city)}\b', re.IGNORECASE) for city in cities]
+    # One scan over all cities: most templates mention none, so skip the per-city loop
+    any_city = re.compile(r'\b(?:' + '|'.join(map(re.escape, cities)) + r')\b', re.IGNORECASE) if cities else None
+
     regex_exact_time = re.compile(r'\b\d{1,2}:\d{2}\b') 
     regex_hour_only = re.compile(r'\balle \d{1,2}\b(?!\:)') 
     
@@ -93,11 +98,10 @@ def normalize_corpus():
             # 1. Replace city names
             # Only do this for files likely to have cities (search, refinement, etc.)
             # But safer to do it for all if we want extreme normalization
-            for city in cities:
-                # Use word boundaries for cities
-                pat = re.compile(rf'\b{re.escape(city)}\b', re.IGNORECASE)
-                if pat.search(template):
-                    template = pat.sub("{destination}", template)
+            if any_city is not None and any_city.search(template):
+                for pat in city_patterns:
+                    if pat.search(template):
+                        template = pat.sub("{destination}", template)
 
             # 2. Replace HH:MM
             if regex_exact_time.search(template):
@@ -127,7 +131,7 @@ def normalize_corpus():
         if len(final_data) < len(data) or modified_count > 0:
             print(f"  Modified {modified_count} templates. Deduplicated from {len(data)} to {len(final_data)}.")
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(final_data, f, indent=2, ensure_ascii=False)
+                f.write(json.dumps(final_data, indent=2, ensure_ascii=False))
             total_modified_files += 1
         else:
             print("  No changes.")
@@ -130,7 +130,7 @@ def main():
     for fname, data in final_collections.items():
         out_p = os.path.join(output_dir, fname)
         with open(out_p, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(data, indent=2, ensure_ascii=False))
         print(f"Wrote {len(data)} items to {fname}")
 
 if __name__ == "__main__":
@@ -32,6 +32,12 @@ REFINEMENT_INDICATORS = [
     "cambio", "classe", "posto", "senza", "con", "vers" # verso
 ]
 
+# Matchers built once: str.startswith takes a tuple, and the blacklist is one regex scan.
+# "no" is never an opener ("No, ..." may be a refinement starting with "No, grazie").
+OPENING_PREFIXES = tuple(ind for ind in OPENING_INDICATORS if ind != "no")
+INTENT_BLACKLIST_RE = re.compile("|".join(map(re.escape, INTENT_BLACKLIST)))
+REFINEMENT_PREFIXES = tuple(REFINEMENT_INDICATORS)
+
 def load_json(path):
     if not path.exists():
         return []
@@ -40,37 +46,24 @@ def load_json(path):
 
 def save_json(path, data):
     with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
 
 def is_opening(text):
     text_lower = text.lower().strip()
     
     # Check strict openers
-    for ind in OPENING_INDICATORS:
-        if text_lower.startswith(ind):
-            # Exception: "No, ..." might be a refinement starting with "No, grazie"
-            if ind == "no" or text_lower.startswith("no,"):
-                continue
-            return True
+    # Exception: "No, ..." might be a refinement starting with "No, grazie"
+    if text_lower.startswith(OPENING_PREFIXES) and not text_lower.startswith("no,"):
+        return True
             
     # Check for full intent phrases inside the text (Refinements shouldn't restate "I need to go to X")
     # Unless it's a correction "No, devo andare a Milano" (handled by "No" check maybe?)
     # But "Allora devo andare a..." is a restart.
-    
-    for phrase in INTENT_BLACKLIST:
-        if phrase in text_lower:
-             # If it has a strong refinement indicator, maybe keep it?
-             # E.g. "No, invece devo andare a Roma" -> keep.
-             # "Allora devo andare a Roma" -> discard.
-             
-             is_refinement = False
-             for ref in REFINEMENT_INDICATORS:
-                 if text_lower.startswith(ref):
-                     is_refinement = True
-                     break
-             
-             if not is_refinement:
-                 return True
+    if INTENT_BLACKLIST_RE.search(text_lower):
+        # If it has a strong refinement indicator, keep it.
+        # E.g. "No, invece devo andare a Roma" -> keep.
+        # "Allora devo andare a Roma" -> discard.
+        return not text_lower.startswith(REFINEMENT_PREFIXES)
                  
     return False
 